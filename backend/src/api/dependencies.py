@@ -1,4 +1,7 @@
+from typing import Iterator
+
 from database.service import DatabaseService
+from sqlalchemy.orm import Session
 
 # Create a singleton database service instance
 db_service = DatabaseService()
@@ -9,3 +12,15 @@ def get_db_service() -> DatabaseService:
     Used with FastAPI Depends() for endpoints that need database access.
     """
     return db_service
+
+def get_db() -> Iterator[Session]:
+    """
+    Dependency yielding a database session scoped to a single request.
+    The session is always closed (returning its connection to the pool)
+    once the response has been sent.
+    """
+    session = db_service.get_session()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -1,26 +1,47 @@
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from api.dependencies import get_db_service
+from api.dependencies import db_service, get_db, get_db_service
 from api.models import (
     CategoryResponse,
+    IPFSUploadJobResponse,
     LigandResponse,
     ProteinListResponse,
     ProteinResponse,
     ProteinWithLigandsResponse,
 )
+from api.utils import TTLCache, compute_etag, etag_matches
+from database.models import Ligand, Protein, ProteinCategory
 from database.service import DatabaseService
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from ipfs.pinata_post import upload_json_to_ipfs  # Add this import at the top
+from fastapi.responses import ORJSONResponse
+from ipfs.pinata_post import create_ipfs_session, iter_upload_json_to_ipfs
 from loguru import logger
-from pydantic import BaseModel  # Add this import for the new response model
+from pydantic import BaseModel, ValidationError  # Add this import for the new response model
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 
 
-# Update the response model for this endpoint
-class IPFSHashResponse(BaseModel):
-    hash: str
-    protein_id: str
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared HTTP clients on startup and close them on shutdown."""
+    # One pooled session keeps Pinata connections warm across requests
+    app.state.ipfs_session = create_ipfs_session()
+    # Rewrite any chain_data still stored in the legacy list layout
+    await run_in_threadpool(db_service.normalize_chain_data)
+    yield
+    await app.state.ipfs_session.close()
 
 
 # Initialize FastAPI app
@@ -28,6 +49,8 @@ app = FastAPI(
     title="Molecular Docking Data Management API",
     description="API for managing protein structures, ligands, and docking results with blockchain verification",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS for frontend access
@@ -40,255 +63,284 @@ app.add_middleware(
 )
 
 
-def serialize_datetime(obj):
-    """Helper function to serialize datetime objects"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    return obj
+# Columns selected for ProteinBase list responses
+PROTEIN_LIST_COLUMNS = (
+    "id",
+    "pdb_id",
+    "title",
+    "description",
+    "resolution",
+    "experiment_type",
+    "num_chains",
+    "chain_data",
+    "status",
+)
+
+# Page size bounds for keyset-paginated list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# In-process caches for rarely-changing read endpoints
+stats_cache = TTLCache(maxsize=1, ttl=60)
+categories_cache = TTLCache(maxsize=1, ttl=300)
+ipfs_hash_cache = TTLCache(maxsize=1024, ttl=300)
+
+# Background IPFS upload jobs. Pending/running jobs are never evicted;
+# finished jobs are kept in a bounded cache for a day after completion.
+active_ipfs_jobs: Dict[str, Dict] = {}
+ipfs_jobs = TTLCache(maxsize=100, ttl=24 * 60 * 60)
 
 
 # Protein management endpoints
 @app.get("/proteins/", response_model=ProteinListResponse)
-async def get_proteins(
+def get_proteins(
     category: Optional[str] = None,
+    cursor: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: Session = Depends(get_db),
     db_service: DatabaseService = Depends(get_db_service),
 ):
     """
-    Retrieve a list of all protein structures.
+    Retrieve a page of protein structures ordered by ID.
 
     - **category**: Optional filter by protein category/family
+    - **cursor**: ID of the last protein from the previous page (keyset cursor)
+    - **limit**: Maximum number of proteins to return
     """
     try:
+        # Only select the columns serialized by ProteinBase
         if category:
-            proteins = db_service.get_proteins_by_category(category)
+            proteins = db_service.get_proteins_by_category(
+                category,
+                limit=limit,
+                columns=PROTEIN_LIST_COLUMNS,
+                after_id=cursor,
+                session=session,
+            )
         else:
-            proteins = db_service.get_all_proteins()
-
-        # Transform chain_data from list to dictionary for all proteins
-        for protein in proteins:
-            # If chain_data is a list, convert it to a dictionary with chains as keys
-            if isinstance(protein.chain_data, list):
-                chain_dict = {}
-                for chain in protein.chain_data:
-                    chain_id = chain.get("chain_id")
-                    if chain_id:
-                        # Remove chain_id from the dict since it's now a key
-                        chain_data = {k: v for k, v in chain.items() if k != "chain_id"}
-                        chain_dict[chain_id] = chain_data
-                protein.chain_data = chain_dict
+            proteins = db_service.get_all_proteins(
+                limit=limit,
+                columns=PROTEIN_LIST_COLUMNS,
+                after_id=cursor,
+                session=session,
+            )
 
-        return {
-            "total": len(proteins),
-            "offset": 0,
-            "limit": len(proteins),
-            "proteins": proteins,
-        }
+        # A full page means there may be more rows after the last ID
+        next_cursor = proteins[-1].id if len(proteins) == limit else None
+
+        # Serialize the selected rows straight to JSON; returning a response
+        # skips re-validating every row through the Pydantic model
+        return ORJSONResponse(
+            {
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "proteins": [protein._asdict() for protein in proteins],
+            }
+        )
     except Exception as e:
         logger.error(f"Error retrieving proteins: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
 @app.get("/proteins/{pdb_id}", response_model=ProteinResponse)
-async def get_protein_by_id(
-    pdb_id: str, db_service: DatabaseService = Depends(get_db_service)
-):
+def get_protein_by_id(pdb_id: str, session: Session = Depends(get_db)):
     """
     Retrieve detailed information about a protein structure by PDB ID.
 
     - **pdb_id**: PDB identifier of the protein
     """
-    session = db_service.get_session()
-    try:
-        # Use the session to get the protein with categories eagerly loaded
-        from database.models import Protein
-        from sqlalchemy.orm import joinedload
-
-        protein = (
-            session.query(Protein)
-            .options(joinedload(Protein.categories))
-            .filter(Protein.pdb_id == pdb_id)
-            .first()
+    # Use the session to get the protein with categories eagerly loaded
+    protein = (
+        session.query(Protein)
+        .options(joinedload(Protein.categories), selectinload(Protein.ligands))
+        .filter(Protein.pdb_id == pdb_id)
+        .first()
+    )
+
+    if not protein:
+        raise HTTPException(
+            status_code=404, detail=f"Protein with PDB ID {pdb_id} not found"
         )
 
-        if not protein:
-            raise HTTPException(
-                status_code=404, detail=f"Protein with PDB ID {pdb_id} not found"
-            )
-
-        # Transform chain_data from list to dictionary
-        if isinstance(protein.chain_data, list):
-            chain_dict = {}
-            for chain in protein.chain_data:
-                chain_id = chain.get("chain_id")
-                if chain_id:
-                    # Remove chain_id from the dict since it's now a key
-                    chain_data = {k: v for k, v in chain.items() if k != "chain_id"}
-                    chain_dict[chain_id] = chain_data
-            protein.chain_data = chain_dict
-
-        # Get ligands for this protein
-        ligands = db_service.get_ligands_by_protein_id(protein.id)
-
-        # Create a copy of the protein data
-        protein_data = {
-            "id": protein.id,
-            "pdb_id": protein.pdb_id,
-            "title": protein.title,
-            "quality": protein.quality,
-            "temperature": protein.temperature,
-            "description": protein.description,
-            "experiment_type": protein.experiment_type,
-            "chain_data": protein.chain_data,
-            "resolution": protein.resolution,
-            "categories": [
-                {"id": c.id, "name": c.name, "description": c.description}
-                for c in protein.categories
-            ],
-            "created_at": protein.created_at,
-            "updated_at": protein.updated_at,
-        }
-
-        return {"protein": protein_data, "ligands": ligands}
-    finally:
-        session.close()
+    # The response model reads fields straight from the ORM objects
+    return {"protein": protein, "ligands": protein.ligands}
 
 
 # Ligand management endpoints
 @app.get("/ligands/{ligand_id}", response_model=LigandResponse)
-async def get_ligand_by_id(
-    ligand_id: int, db_service: DatabaseService = Depends(get_db_service)
-):
+def get_ligand_by_id(ligand_id: int, session: Session = Depends(get_db)):
     """
     Retrieve detailed information about a ligand by ID.
 
     - **ligand_id**: Database ID of the ligand
     """
-    # Implement ligand retrieval from database
-    session = db_service.get_session()
-    try:
-        from database.models import Ligand
+    ligand = session.query(Ligand).filter(Ligand.id == ligand_id).first()
+    if not ligand:
+        raise HTTPException(
+            status_code=404, detail=f"Ligand with ID {ligand_id} not found"
+        )
 
-        ligand = session.query(Ligand).filter(Ligand.id == ligand_id).first()
-        print(ligand.binding_metrics)
-        if not ligand:
-            raise HTTPException(
-                status_code=404, detail=f"Ligand with ID {ligand_id} not found"
-            )
-
-        return {"ligand": ligand}
-    finally:
-        session.close()
+    return {"ligand": ligand}
 
 
 # Category management endpoints
 @app.get("/categories/", response_model=List[CategoryResponse])
-async def get_categories(db_service: DatabaseService = Depends(get_db_service)):
+def get_categories(session: Session = Depends(get_db)):
     """
     Retrieve all protein categories/families in the database.
     """
-    session = db_service.get_session()
-    try:
-        from database.models import ProteinCategory
-
-        categories = session.query(ProteinCategory).all()
-        return categories
-    finally:
-        session.close()
+    categories = categories_cache.get("all")
+    if categories is None:
+        categories = [
+            {"id": c.id, "name": c.name, "description": c.description}
+            for c in session.query(ProteinCategory).all()
+        ]
+        categories_cache.set("all", categories)
+
+    return categories
+
+
+def query_proteins_for_export(session: Session) -> list:
+    """Load every protein with the categories and ligands uploaded to IPFS."""
+    # Fetch proteins, categories and ligands in a single joined SELECT,
+    # skipping columns (e.g. ligand binding_metrics) that are not uploaded.
+    # Proteins carry only a handful of categories, so joining both
+    # collections multiplies rows by a small factor at most.
+    query = session.query(Protein).options(
+        load_only(
+            Protein.id,
+            Protein.pdb_id,
+            Protein.title,
+            Protein.description,
+            Protein.chain_data,
+            Protein.resolution,
+            Protein.created_at,
+            Protein.updated_at,
+        ),
+        joinedload(Protein.categories),
+        joinedload(Protein.ligands).load_only(
+            Ligand.id,
+            Ligand.residue_name,
+            Ligand.chain_id,
+            Ligand.residue_id,
+            Ligand.num_atoms,
+            Ligand.center_x,
+            Ligand.center_y,
+            Ligand.center_z,
+            Ligand.binding_site_data,
+            Ligand.created_at,
+            Ligand.updated_at,
+        ),
+    )
+    return query.all()
+
+
+def build_ipfs_payloads(proteins):
+    """Lazily build IPFS payloads so they are encoded while uploads run."""
+    for protein in proteins:
+        # Prepare data for IPFS; a row that does not fit the export model is
+        # skipped so it cannot abort the rest of the export
+        try:
+            payload = ProteinWithLigandsResponse.model_validate(
+                {"protein": protein, "ligands": protein.ligands}
+            )
+        except ValidationError as e:
+            logger.warning(f"Skipping {protein.pdb_id} in IPFS export: {e}")
+            continue
+        yield payload.model_dump()
 
 
-# New endpoint to get all proteins with their ligands
-@app.get("/proteins-with-ligands/", response_model=List[IPFSHashResponse])
-async def get_all_proteins_with_ligands(
-    db_service: DatabaseService = Depends(get_db_service),
-):
+async def upload_proteins_to_ipfs(proteins, db_service: DatabaseService):
     """
-    Retrieve all proteins along with their corresponding ligands and store them in IPFS.
-    Returns a list of IPFS hashes with their corresponding protein IDs.
+    Upload proteins to IPFS concurrently, yielding a hash record per completed
+    upload. All hashes are stored in the database in one transaction at the end.
     """
-    session = db_service.get_session()
+    ipfs_hashes = {}
     try:
-        import json
-
-        from database.models import Protein
-        from sqlalchemy.orm import joinedload
-
-        proteins = session.query(Protein).options(joinedload(Protein.categories)).all()
-        ipfs_results = []
-
-        for protein in proteins:
-            # Transform chain_data
-            if isinstance(protein.chain_data, list):
-                chain_dict = {}
-                for chain in protein.chain_data:
-                    chain_id = chain.get("chain_id")
-                    if chain_id:
-                        chain_data = {k: v for k, v in chain.items() if k != "chain_id"}
-                        chain_dict[chain_id] = chain_data
-                protein.chain_data = chain_dict
-
-            # Get ligands for this protein
-            ligands_objects = db_service.get_ligands_by_protein_id(protein.id)
-
-            # Convert ligand objects to dictionaries
-            ligands = []
-            for ligand in ligands_objects:
-                ligand_dict = {
-                    "id": ligand.id,
-                    "residue_name": ligand.residue_name,
-                    "chain_id": ligand.chain_id,
-                    "residue_id": ligand.residue_id,
-                    "num_atoms": ligand.num_atoms,
-                    "center_x": ligand.center_x,
-                    "center_y": ligand.center_y,
-                    "center_z": ligand.center_z,
-                    "binding_site_data": ligand.binding_site_data,
-                    "created_at": serialize_datetime(ligand.created_at),
-                    "updated_at": serialize_datetime(ligand.updated_at),
-                }
-                ligands.append(ligand_dict)
-
-            # Create protein data with categories
-            protein_data = {
-                "id": protein.id,
-                "pdb_id": protein.pdb_id,
-                "title": protein.title,
-                "description": protein.description,
-                "chain_data": protein.chain_data,
-                "resolution": protein.resolution,
-                "categories": [
-                    {"id": c.id, "name": c.name, "description": c.description}
-                    for c in protein.categories
-                ],
-                "created_at": serialize_datetime(protein.created_at),
-                "updated_at": serialize_datetime(protein.updated_at),
-            }
-
-            # Prepare data for IPFS
-            protein_with_ligands = {"protein": protein_data, "ligands": ligands}
-
-            # Upload to IPFS and get hash
-            ipfs_response = upload_json_to_ipfs(protein_with_ligands)
+        async for _, ipfs_response in iter_upload_json_to_ipfs(
+            build_ipfs_payloads(proteins), session=app.state.ipfs_session
+        ):
+            if not ipfs_response.get("hash"):
+                continue
+
+            # Use pdb_id (not the primary key) as the protein ID
+            pdb_id = ipfs_response["protein_id"]
+            ipfs_hashes[pdb_id] = ipfs_response["hash"]
+            yield {"hash": ipfs_response["hash"], "protein_id": pdb_id}
+    finally:
+        await run_in_threadpool(db_service.store_protein_ipfs_hashes_bulk, ipfs_hashes)
+        ipfs_hash_cache.clear()
 
-            # Extract just the hash string from the response
-            if isinstance(ipfs_response, dict) and "hash" in ipfs_response:
-                ipfs_hash = ipfs_response["hash"]
-            elif hasattr(ipfs_response, "hash"):
-                ipfs_hash = ipfs_response.hash
-            else:
-                ipfs_hash = str(ipfs_response)
 
-            # Store the hash in the database (only the string)
-            db_service.store_protein_ipfs_hash(protein.pdb_id, ipfs_hash)
+async def run_ipfs_upload_job(job: Dict, db_service: DatabaseService):
+    """Background task uploading all proteins to IPFS and recording progress on job."""
+    job["status"] = "running"
+    try:
+        session = db_service.get_session()
+        try:
+            proteins = await run_in_threadpool(query_proteins_for_export, session)
+        finally:
+            session.close()
 
-            # Add to results - use pdb_id (not the primary key)
-            ipfs_results.append({"hash": ipfs_hash, "protein_id": protein.pdb_id})
+        async for result in upload_proteins_to_ipfs(proteins, db_service):
+            job["results"].append(result)
 
-        return ipfs_results
+        job["status"] = "completed"
     except Exception as e:
-        logger.error(f"Error uploading to IPFS: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+        logger.error(f"IPFS upload job {job['job_id']} failed: {str(e)}")
+        job["status"] = "failed"
+        job["error"] = str(e)
     finally:
-        session.close()
+        job["completed_at"] = datetime.now()
+        ipfs_jobs.set(job["job_id"], job)
+        active_ipfs_jobs.pop(job["job_id"], None)
+
+
+# Uploads only run as background jobs; GET is kept for existing callers and
+# enqueues the same job as POST instead of uploading inside the request
+@app.get(
+    "/proteins-with-ligands/",
+    response_model=IPFSUploadJobResponse,
+    status_code=202,
+)
+@app.post(
+    "/proteins-with-ligands/",
+    response_model=IPFSUploadJobResponse,
+    status_code=202,
+)
+def start_ipfs_upload_job(
+    background_tasks: BackgroundTasks,
+    db_service: DatabaseService = Depends(get_db_service),
+):
+    """
+    Start uploading all proteins with their ligands to IPFS in the background.
+    Returns immediately with a job ID that can be polled at /jobs/{job_id}.
+    """
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "status": "pending",
+        "results": [],
+        "error": None,
+        "created_at": datetime.now(),
+        "completed_at": None,
+    }
+    active_ipfs_jobs[job["job_id"]] = job
+    background_tasks.add_task(run_ipfs_upload_job, job, db_service)
+    return job
+
+
+@app.get("/jobs/{job_id}", response_model=IPFSUploadJobResponse)
+def get_ipfs_upload_job(job_id: str):
+    """
+    Retrieve the status and results of a background IPFS upload job.
+
+    - **job_id**: ID returned when the job was started
+    """
+    job = active_ipfs_jobs.get(job_id) or ipfs_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    return job
 
 
 # Define a response model for the IPFS hash endpoint
@@ -298,8 +350,12 @@ class ProteinIPFSResponse(BaseModel):
 
 
 @app.get("/proteins/{pdb_id}/ipfs", response_model=ProteinIPFSResponse)
-async def get_ipfs_hash_by_protein_id(
-    pdb_id: str, db_service: DatabaseService = Depends(get_db_service)
+def get_ipfs_hash_by_protein_id(
+    pdb_id: str,
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_db),
+    db_service: DatabaseService = Depends(get_db_service),
 ):
     """
     Retrieve the IPFS hash for a specific protein by its PDB ID.
@@ -307,16 +363,30 @@ async def get_ipfs_hash_by_protein_id(
     - **pdb_id**: PDB identifier of the protein
     """
     try:
-        ipfs_data = db_service.get_ipfs_hash_by_protein_id(pdb_id)
-        if not ipfs_data:
+        ipfs_data = ipfs_hash_cache.get(pdb_id)
+        if ipfs_data is None:
+            ipfs_data = db_service.get_ipfs_hash_by_protein_id(pdb_id, session=session)
+            if ipfs_data and ipfs_data.get("hash"):
+                ipfs_hash_cache.set(pdb_id, ipfs_data)
+
+        if not ipfs_data or not ipfs_data.get("hash"):
             raise HTTPException(
                 status_code=404,
                 detail=f"IPFS hash for protein with PDB ID {pdb_id} not found",
             )
 
+        # IPFS hashes are content addresses, so the hash itself is a stable ETag
+        etag = compute_etag(ipfs_data["hash"])
+        cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        response.headers.update(cache_headers)
         return {
             "ipfs_hash": ipfs_data["hash"],
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving IPFS hash: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -324,8 +394,16 @@ async def get_ipfs_hash_by_protein_id(
 
 # Statistics endpoints
 @app.get("/stats")
-async def get_database_stats(db_service: DatabaseService = Depends(get_db_service)):
+def get_database_stats(
+    session: Session = Depends(get_db),
+    db_service: DatabaseService = Depends(get_db_service),
+):
     """
     Get database statistics including counts of proteins, ligands, and categories.
     """
-    return db_service.get_database_stats()
+    stats = stats_cache.get("stats")
+    if stats is None:
+        stats = db_service.get_database_stats(session=session)
+        stats_cache.set("stats", stats)
+
+    return stats
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
@@ -9,8 +9,7 @@ class CategoryBase(BaseModel):
     name: str
     description: Optional[str] = None
     
-    class Config:
-        from_attributes = True  # For SQLAlchemy compatibility
+    model_config = ConfigDict(from_attributes=True)  # For SQLAlchemy compatibility
 
 class LigandBase(BaseModel):
     """Base model for ligand data"""
@@ -26,8 +25,7 @@ class LigandBase(BaseModel):
     binding_site_data: Optional[Dict[str, Any]] = None
     binding_metrics: Optional[Dict[str, Any]] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ProteinBase(BaseModel):
     """Base model for protein structure data"""
@@ -41,8 +39,7 @@ class ProteinBase(BaseModel):
     chain_data: Optional[Dict[str, Any]] = None
     status: str = "processed"
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DockingResultBase(BaseModel):
     """Base model for docking results"""
@@ -57,8 +54,7 @@ class DockingResultBase(BaseModel):
     docking_parameters: Optional[Dict[str, Any]] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Response models
 class CategoryResponse(CategoryBase):
@@ -67,6 +63,8 @@ class CategoryResponse(CategoryBase):
 
 class LigandResponse(BaseModel):
     """Response model for ligand data"""
+    model_config = ConfigDict(from_attributes=True)
+
     ligand: LigandBase
 
 class ProteinDetailedResponse(ProteinBase):
@@ -77,14 +75,15 @@ class ProteinDetailedResponse(ProteinBase):
 
 class ProteinResponse(BaseModel):
     """Response model for protein data with its ligands"""
+    model_config = ConfigDict(from_attributes=True)
+
     protein: ProteinDetailedResponse
     ligands: List[LigandBase] = []
 
 class ProteinListResponse(BaseModel):
-    """Response model for a list of proteins"""
-    total: int
-    offset: int
+    """Response model for a page of proteins"""
     limit: int
+    next_cursor: Optional[int] = None
     proteins: List[ProteinBase]
 
 class DockingResultResponse(DockingResultBase):
@@ -109,18 +108,58 @@ class BlockchainVerificationResponse(BaseModel):
     timestamp: str
     error: Optional[str] = None
 
+class LigandExportData(BaseModel):
+    """Ligand fields included in IPFS exports"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    residue_name: Optional[str] = None
+    chain_id: Optional[str] = None
+    residue_id: Optional[str] = None
+    num_atoms: Optional[int] = None
+    center_x: Optional[float] = None
+    center_y: Optional[float] = None
+    center_z: Optional[float] = None
+    binding_site_data: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class ProteinExportData(BaseModel):
+    """Protein fields included in IPFS exports"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    pdb_id: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    chain_data: Optional[Dict[str, Any]] = None
+    resolution: Optional[float] = None
+    categories: List[CategoryBase] = []
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
 class ProteinWithLigandsResponse(BaseModel):
     """Response model for a protein with its associated ligands"""
-    protein: Dict[str, Any]
-    ligands: List[Dict[str, Any]]
+    model_config = ConfigDict(from_attributes=True)
+
+    protein: ProteinExportData
+    ligands: List[LigandExportData]
 
 class IPFSHashResponse(BaseModel):
     """Response model for IPFS hash data"""
     hash: str
     protein_id: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class IPFSUploadJobResponse(BaseModel):
+    """Response model for a background IPFS upload job"""
+    job_id: str
+    status: str  # 'pending', 'running', 'completed', 'failed'
+    results: List[IPFSHashResponse] = []
+    error: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
 
 # Request models
 class UploadPDBRequest(BaseModel):
@@ -143,7 +182,8 @@ class DockingSubmitRequest(BaseModel):
     exhaustiveness: int = 8
     docking_program: str = "vina"
     
-    @validator('box_size')
+    @field_validator('box_size')
+    @classmethod
     def box_size_must_be_positive(cls, v):
         if v <= 0:
             raise ValueError('Box size must be positive')
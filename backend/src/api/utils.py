@@ -1,7 +1,13 @@
 import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Hashable, Optional, Union
+
+# Read size used when hashing files without hashlib.file_digest
+HASH_CHUNK_SIZE = 1 << 20
 
 def calculate_file_hash(file_path: Union[str, Path]) -> str:
     """
@@ -14,15 +20,49 @@ def calculate_file_hash(file_path: Union[str, Path]) -> str:
         Hash string of the file
     """
     file_path = Path(file_path)
-    hash_obj = hashlib.sha256()
-    
+
     with open(file_path, "rb") as f:
-        # Read in chunks to handle large files
-        for chunk in iter(lambda: f.read(4096), b""):
+        # Python 3.11+ hashes with large buffers and releases the GIL
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        # Read in 1 MiB chunks to handle large files
+        hash_obj = hashlib.sha256()
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
             hash_obj.update(chunk)
-    
+
     return hash_obj.hexdigest()
 
+def compute_etag(value: str) -> str:
+    """
+    Compute a strong ETag for a string value.
+    
+    Args:
+        value: Content that uniquely identifies the response body
+        
+    Returns:
+        Quoted ETag header value
+    """
+    digest = hashlib.blake2b(value.encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether an If-None-Match header matches the given ETag.
+    
+    Args:
+        if_none_match: Raw If-None-Match request header, if any
+        etag: Current ETag of the resource
+        
+    Returns:
+        True if the client's cached copy is still valid
+    """
+    if not if_none_match:
+        return False
+    
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
 def format_pagination_metadata(
     total_items: int,
     limit: int,
@@ -88,3 +128,49 @@ def safe_json_parse(json_str: Optional[str]) -> Optional[Dict[str, Any]]:
         return json.loads(json_str)
     except json.JSONDecodeError:
         return None
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and LRU eviction.
+
+    Safe to share between the threadpool workers that run sync endpoints.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        """
+        Args:
+            maxsize: Maximum number of entries kept before evicting the oldest
+            ttl: Seconds an entry stays valid after being stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._data.clear()
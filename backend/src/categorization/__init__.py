@@ -1,12 +1,91 @@
+import ast
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 from Bio.PDB import PDBParser
+from Bio.PDB.kdtrees import KDTree
 from loguru import logger
 from rdkit import Chem
 from rdkit.Chem import QED, Descriptors, Lipinski
 
+# Residues with any atom within this distance (Angstroms) of the ligand
+# form the binding site
+BINDING_SITE_CUTOFF = 5.0
+
+# Residue polarity classification
+POLAR_RESIDUES = frozenset(
+    ["ARG", "LYS", "ASP", "GLU", "GLN", "ASN", "HIS", "SER", "THR", "TYR"]
+)
+
+
+# Shared parser for cached structure parsing
+_pdb_parser = PDBParser(QUIET=True)
+
+
+@lru_cache(maxsize=64)
+def _parse_structure(pdb_id: str, structure_file: str, mtime: float):
+    """
+    Parse a PDB file, cached so re-enhancing a structure skips the text parse.
+
+    Args:
+        pdb_id: PDB ID of the structure
+        structure_file: Path to the PDB file
+        mtime: File modification time; a changed file gets a new cache entry
+
+    Returns:
+        BioPython Structure object (shared, must not be modified)
+    """
+    return _pdb_parser.get_structure(pdb_id, structure_file)
+
+
+@lru_cache(maxsize=100_000)
+def _calculate_ligand_properties(ligand_smiles: str) -> Dict:
+    """
+    Calculate chemical properties for a ligand, cached by SMILES string so
+    ligands repeated across structures are only parsed and described once.
+
+    Args:
+        ligand_smiles: SMILES string of the ligand
+
+    Returns:
+        Dictionary of calculated properties
+    """
+    mol = Chem.MolFromSmiles(ligand_smiles)
+    if not mol:
+        return {"error": "Invalid SMILES string"}
+
+    # Compute each descriptor once and reuse it below
+    molecular_weight = Descriptors.MolWt(mol)
+    logp = Descriptors.MolLogP(mol)
+    h_donors = Lipinski.NumHDonors(mol)
+    h_acceptors = Lipinski.NumHAcceptors(mol)
+    qed = QED.qed(mol)  # Drug-likeness score
+
+    lipinski_violations = (
+        (molecular_weight > 500)
+        + (h_donors > 5)
+        + (h_acceptors > 10)
+        + (logp > 5)
+    )
+
+    return {
+        "molecular_weight": molecular_weight,
+        "logp": logp,
+        "h_donors": h_donors,
+        "h_acceptors": h_acceptors,
+        "rotatable_bonds": Descriptors.NumRotatableBonds(mol),
+        "rings": Descriptors.RingCount(mol),
+        "qed": qed,
+        "tpsa": Descriptors.TPSA(mol),
+        "lipinski_violations": int(lipinski_violations),
+        "is_druglike": qed > 0.5 and lipinski_violations <= 1,
+    }
+
 
 class StructureCategorizer:
     """
@@ -21,8 +100,9 @@ class StructureCategorizer:
             data_dir: Directory containing processed structure data
         """
         self.data_dir = Path(data_dir)
-        self.pdb_parser = PDBParser(QUIET=True)
+        self.pdb_parser = _pdb_parser
         self.structures_df = None
+        self.structure_rows = {}  # Processed rows keyed by PDB ID
         logger.info(
             f"Structure Categorizer initialized. Data directory: {self.data_dir}"
         )
@@ -78,6 +158,13 @@ class StructureCategorizer:
                 return pd.DataFrame()
 
             self.structures_df = pd.read_csv(structures_file)
+
+            # Index rows by PDB ID once so lookups don't scan the DataFrame,
+            # keeping the first row for duplicated IDs
+            self.structure_rows = {}
+            for row in self.structures_df.to_dict("records"):
+                self.structure_rows.setdefault(row["pdb_id"], row)
+
             logger.info(f"Loaded {len(self.structures_df)} processed structures")
             return self.structures_df
 
@@ -99,23 +186,23 @@ class StructureCategorizer:
         protein_description = metadata_dict.get("title", "").lower()
         classification = metadata_dict.get("keywords", [])
 
-        categories = []
+        # Lowercase the classification once and search it as a single text;
+        # the newline separator keeps keywords from matching across items
+        classification_text = "\n".join(
+            item.lower() for item in classification if isinstance(item, str)
+        )
 
         # Check for matches in protein families
-        for family, keywords in self.protein_families.items():
-            for keyword in keywords:
-                if keyword in protein_description:
-                    categories.append(family)
-                    break
-
-                if any(
-                    keyword in item.lower() if isinstance(item, str) else False
-                    for item in classification
-                ):
-                    categories.append(family)
-                    break
+        categories = {
+            family
+            for family, keywords in self.protein_families.items()
+            if any(
+                keyword in protein_description or keyword in classification_text
+                for keyword in keywords
+            )
+        }
 
-        return list(set(categories))  # Remove duplicates
+        return list(categories)
 
     def extract_binding_site_info(self, structure, ligand_data: Dict) -> Dict:
         """
@@ -143,21 +230,45 @@ class StructureCategorizer:
             binding_residues = []
             ligand_atoms = list(ligand.get_atoms())
 
-            for chain in model:
-                for residue in chain:
-                    if residue.id[0] == " ":  # Only consider standard residues
-                        for res_atom in residue.get_atoms():
-                            for lig_atom in ligand_atoms:
-                                if res_atom - lig_atom < 5.0:  # Distance in Angstroms
-                                    binding_residues.append(
-                                        {
-                                            "chain_id": chain.id,
-                                            "residue_id": residue.id[1],
-                                            "residue_name": residue.get_resname(),
-                                            "distance": res_atom - lig_atom,
-                                        }
-                                    )
-                                    break
+            # Only consider standard residues
+            residue_atoms = [
+                (chain, residue, res_atom)
+                for chain in model
+                for residue in chain
+                if residue.id[0] == " "
+                for res_atom in residue.get_atoms()
+            ]
+
+            if residue_atoms and ligand_atoms:
+                # Index residue atoms in a KD-tree so each ligand atom is one
+                # radius query instead of a comparison against every atom
+                coords = np.array(
+                    [res_atom.coord for _, _, res_atom in residue_atoms], dtype="d"
+                )
+                tree = KDTree(coords, 10)
+
+                # Candidate ligand atoms per residue atom, in ligand atom order.
+                # The small margin covers float32 rounding in the exact check below.
+                candidates = defaultdict(list)
+                for lig_index, lig_atom in enumerate(ligand_atoms):
+                    center = np.array(lig_atom.coord, dtype="d")
+                    for point in tree.search(center, BINDING_SITE_CUTOFF + 1e-3):
+                        candidates[point.index].append(lig_index)
+
+                for atom_index in sorted(candidates):
+                    chain, residue, res_atom = residue_atoms[atom_index]
+                    for lig_index in candidates[atom_index]:
+                        distance = res_atom - ligand_atoms[lig_index]
+                        if distance < BINDING_SITE_CUTOFF:  # Distance in Angstroms
+                            binding_residues.append(
+                                {
+                                    "chain_id": chain.id,
+                                    "residue_id": residue.id[1],
+                                    "residue_name": residue.get_resname(),
+                                    "distance": distance,
+                                }
+                            )
+                            break
 
             # Calculate binding site properties
             binding_site = {
@@ -188,23 +299,9 @@ class StructureCategorizer:
         if not binding_residues:
             return 0.0
 
-        # Residue polarity classification
-        polar_residues = [
-            "ARG",
-            "LYS",
-            "ASP",
-            "GLU",
-            "GLN",
-            "ASN",
-            "HIS",
-            "SER",
-            "THR",
-            "TYR",
-        ]
-
         # Count polar residues
         polar_count = sum(
-            1 for r in binding_residues if r["residue_name"] in polar_residues
+            r["residue_name"] in POLAR_RESIDUES for r in binding_residues
         )
 
         # Return polarity ratio
@@ -221,43 +318,8 @@ class StructureCategorizer:
             Dictionary of calculated properties
         """
         try:
-            mol = Chem.MolFromSmiles(ligand_smiles)
-            if not mol:
-                return {"error": "Invalid SMILES string"}
-
-            properties = {
-                "molecular_weight": Descriptors.MolWt(mol),
-                "logp": Descriptors.MolLogP(mol),
-                "h_donors": Lipinski.NumHDonors(mol),
-                "h_acceptors": Lipinski.NumHAcceptors(mol),
-                "rotatable_bonds": Descriptors.NumRotatableBonds(mol),
-                "rings": Descriptors.RingCount(mol),
-                "qed": QED.qed(mol),  # Drug-likeness score
-                "tpsa": Descriptors.TPSA(mol),
-                "lipinski_violations": sum(
-                    1
-                    for x in [
-                        Descriptors.MolWt(mol) > 500,
-                        Lipinski.NumHDonors(mol) > 5,
-                        Lipinski.NumHAcceptors(mol) > 10,
-                        Descriptors.MolLogP(mol) > 5,
-                    ]
-                    if x
-                ),
-                "is_druglike": QED.qed(mol) > 0.5
-                and sum(
-                    1
-                    for x in [
-                        Descriptors.MolWt(mol) > 500,
-                        Lipinski.NumHDonors(mol) > 5,
-                        Lipinski.NumHAcceptors(mol) > 10,
-                        Descriptors.MolLogP(mol) > 5,
-                    ]
-                )
-                <= 1,
-            }
-
-            return properties
+            # Copy so callers cannot mutate the cached result
+            return dict(_calculate_ligand_properties(ligand_smiles))
 
         except Exception as e:
             logger.error(f"Error calculating ligand properties: {e}")
@@ -301,13 +363,13 @@ class StructureCategorizer:
             self.load_processed_data()
 
         # Get structure row
-        structure_row = self.structures_df[self.structures_df["pdb_id"] == pdb_id]
-        if structure_row.empty:
+        structure_row = self.structure_rows.get(pdb_id)
+        if structure_row is None:
             logger.error(f"Structure {pdb_id} not found in processed data")
             return {}
 
-        # Extract data
-        structure_data = structure_row.iloc[0].to_dict()
+        # Extract data (copied so the indexed row is left untouched)
+        structure_data = dict(structure_row)
 
         structure_data["title"] = metadata.get("title", "")
         # Add protein family categorization
@@ -365,11 +427,13 @@ class StructureCategorizer:
         # This requires parsing the structure again
         structure_file = Path(f"data/raw/{pdb_id}.pdb")
         if structure_file.exists():
-            structure = self.pdb_parser.get_structure(pdb_id, structure_file)
+            structure = _parse_structure(
+                pdb_id, str(structure_file), structure_file.stat().st_mtime
+            )
 
             # Process each ligand
             ligands = (
-                eval(structure_data["ligands"])
+                ast.literal_eval(structure_data["ligands"])
                 if isinstance(structure_data["ligands"], str)
                 else structure_data["ligands"]
             )
@@ -385,7 +449,10 @@ class StructureCategorizer:
         return structure_data
 
     def batch_enhance_structures(
-        self, pdb_ids: List[str], metadata_dict: Dict
+        self,
+        pdb_ids: List[str],
+        metadata_dict: Dict,
+        max_workers: Optional[int] = None,
     ) -> pd.DataFrame:
         """
         Enhance multiple structures with additional categorization.
@@ -393,16 +460,21 @@ class StructureCategorizer:
         Args:
             pdb_ids: List of PDB IDs to enhance
             metadata_dict: Dictionary mapping PDB IDs to metadata
+            max_workers: Number of worker processes (defaults to CPU count)
 
         Returns:
             DataFrame with enhanced structure data
         """
-        enhanced_data = []
+        tasks = [(pdb_id, metadata_dict.get(pdb_id.upper(), {})) for pdb_id in pdb_ids]
 
-        for pdb_id in pdb_ids:
-            metadata = metadata_dict.get(pdb_id.upper(), {})
-            enhanced = self.enhance_structure_data(pdb_id, metadata)
-            enhanced_data.append(enhanced)
+        # Structures are parsed and searched independently, so spread the
+        # CPU-bound work across processes; each worker loads the data once
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_enhance_worker,
+            initargs=(str(self.data_dir),),
+        ) as executor:
+            enhanced_data = list(executor.map(_enhance_one, tasks, chunksize=4))
 
         # Create DataFrame and save
         enhanced_df = pd.DataFrame(enhanced_data)
@@ -412,3 +484,20 @@ class StructureCategorizer:
             logger.info(f"Saved enhanced data to {output_file}")
 
         return enhanced_df
+
+
+# Categorizer owned by each process-pool worker, created once per process
+_worker_categorizer = None
+
+
+def _init_enhance_worker(data_dir: str):
+    """Create the worker's categorizer and load the processed data once."""
+    global _worker_categorizer
+    _worker_categorizer = StructureCategorizer(data_dir)
+    _worker_categorizer.load_processed_data()
+
+
+def _enhance_one(task) -> Dict:
+    """Enhance a single (pdb_id, metadata) task inside a worker process."""
+    pdb_id, metadata = task
+    return _worker_categorizer.enhance_structure_data(pdb_id, metadata)
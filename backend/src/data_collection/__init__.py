@@ -1,10 +1,121 @@
-import json
-import time
+import asyncio
+import zlib
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import aiohttp
+import orjson
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Maximum number of PDB entries fetched concurrently by batch downloads
+MAX_CONCURRENT_DOWNLOADS = 32
+
+# Size of chunks streamed from download responses to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Formats RCSB also serves gzip-compressed; these are fetched as .gz and
+# decompressed while streaming to disk
+GZIP_FORMATS = frozenset({"pdb", "cif", "xml"})
+
+# zlib window bits that accept a gzip header
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# Number of entries requested per GraphQL metadata query
+METADATA_BATCH_SIZE = 100
+
+# GraphQL query returning the entry metadata read by _process_metadata, in
+# the same shape as the REST entry endpoint. Source organism and annotations
+# live on polymer entities and are flattened onto the entry afterwards
+ENTRY_METADATA_QUERY = """
+query EntryMetadata($ids: [String!]!) {
+  entries(entry_ids: $ids) {
+    rcsb_id
+    struct { title }
+    refine { ls_dres_high ls_rfactor_obs ls_rfactor_rfree }
+    exptl { method }
+    diffrn { ambient_temp }
+    citation { pdbx_database_id_doi pdbx_database_id_pub_med title year }
+    pdbx_database_related { db_id db_name details }
+    struct_keywords { pdbx_keywords }
+    rcsb_binding_affinity { comp_id type value unit symbol provenance_code }
+    polymer_entities {
+      rcsb_entity_source_organism { taxonomy_lineage { name } }
+      rcsb_polymer_entity_annotation { type annotation_value }
+    }
+  }
+}
+"""
+
+# Entity-level sections merged across polymer entities onto the entry
+POLYMER_ENTITY_SECTIONS = (
+    "rcsb_entity_source_organism",
+    "rcsb_polymer_entity_annotation",
+)
+
+# (processed key, metadata section, field) for values taken from the first
+# entry of a list-valued RCSB metadata section
+FIRST_ENTRY_FIELDS = (
+    ("resolution", "refine", "ls_dres_high"),
+    ("r_factor", "refine", "ls_rfactor_obs"),
+    ("r_free", "refine", "ls_rfactor_rfree"),
+    ("experimental_method", "exptl", "method"),
+    ("temperature", "diffrn", "ambient_temp"),
+)
+
+# Fixed parts of the protein-ligand complex search query, built once; the
+# query builder only fills in the resolution cutoff
+PROTEIN_POLYMER_NODE = {
+    "type": "terminal",
+    "service": "text",
+    "parameters": {
+        "attribute": "entity_poly.rcsb_entity_polymer_type",
+        "operator": "exact_match",
+        "value": "Protein",
+    },
+}
+BINDING_AFFINITY_NODE = {
+    "type": "terminal",
+    "service": "text",
+    "parameters": {
+        "attribute": "rcsb_binding_affinity.value",
+        "operator": "exists",
+    },
+}
+SEARCH_REQUEST_OPTIONS = {
+    "paginate": {"start": 0, "rows": 1000},
+    "scoring_strategy": "combined",
+    "sort": [
+        {
+            "sort_by": "rcsb_entry_info.resolution_combined",
+            "direction": "asc",
+        }
+    ],
+}
+
+
+def _resolution_node(resolution_cutoff: float) -> Dict:
+    """Build the search node limiting entries to a maximum resolution."""
+    return {
+        "type": "terminal",
+        "service": "text",
+        "parameters": {
+            "attribute": "rcsb_entry_info.resolution_combined",
+            "operator": "less_or_equal",
+            "value": resolution_cutoff,
+        },
+    }
+
+
+def _drop_nulls(value):
+    """Recursively remove null-valued keys from decoded JSON."""
+    if isinstance(value, dict):
+        return {k: _drop_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_nulls(v) for v in value]
+    return value
 
 
 class PDBCollector:
@@ -15,18 +126,52 @@ class PDBCollector:
     BASE_URL = "https://data.rcsb.org/rest/v1/core"
     SEARCH_URL = "https://search.rcsb.org/rcsbsearch/v2/query"
     DOWNLOAD_URL = "https://files.rcsb.org/download"
+    GRAPHQL_URL = "https://data.rcsb.org/graphql"
 
-    def __init__(self, output_dir: str = "data/raw"):
+    def __init__(
+        self,
+        output_dir: str = "data/raw",
+        max_retries: int = 3,
+        metadata_cache_dir: str = "data/processed/metadata_cache",
+    ):
         """
         Initialize the PDB collector.
 
         Args:
             output_dir: Directory to store downloaded PDB files
+            max_retries: Retries for failed or throttled RCSB requests
+            metadata_cache_dir: Directory for cached metadata and their ETags
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.metadata_cache_dir = Path(metadata_cache_dir)
+        self.metadata_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Keep-alive session shared by all synchronous RCSB requests; urllib3
+        # retries transient errors with backoff and honours Retry-After
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
         logger.info(f"PDB Collector initialized. Output directory: {self.output_dir}")
 
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def search_by_query(self, query: Dict) -> List[str]:
         """
         Search PDB entries using the RCSB Search API.
@@ -40,11 +185,15 @@ class PDBCollector:
 
         logger.debug(f"Sending query to RCSB: {query}")
         try:
-            response = requests.post(self.SEARCH_URL, json=query)
+            response = self._session.post(
+                self.SEARCH_URL,
+                data=orjson.dumps(query),
+                headers={"Content-Type": "application/json"},
+            )
 
             # Check if response is valid JSON before raising for status
             try:
-                response_data = response.json()
+                response_data = orjson.loads(response.content)
             except ValueError:
                 logger.error(f"Invalid JSON response: {response.text}")
                 return []
@@ -80,7 +229,47 @@ class PDBCollector:
             Path to the downloaded file or None if download failed
         """
         pdb_id = pdb_id.lower()
-        
+        output_file, url = self._download_target(pdb_id, file_format)
+
+        # Skip if file already exists
+        if output_file.exists():
+            logger.debug(f"File {output_file} already exists, skipping download")
+            return output_file
+
+        partial_file = output_file.with_name(output_file.name + ".part")
+        try:
+            logger.debug(f"Downloading from URL: {url}")
+
+            with self._session.get(url, stream=True) as response:
+                response.raise_for_status()
+                decompressor = self._decompressor(url)
+                with open(partial_file, "wb") as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        if decompressor:
+                            chunk = decompressor.decompress(chunk)
+                        f.write(chunk)
+                    if decompressor:
+                        f.write(decompressor.flush())
+
+            partial_file.replace(output_file)
+            logger.info(f"Downloaded {pdb_id} to {output_file}")
+            return output_file
+        except (requests.exceptions.RequestException, zlib.error) as e:
+            partial_file.unlink(missing_ok=True)
+            logger.error(f"Error downloading {pdb_id}: {e}")
+            return None
+
+    def _download_target(self, pdb_id: str, file_format: str) -> Tuple[Path, str]:
+        """
+        Determine the local path and download URL for a PDB entry.
+
+        Args:
+            pdb_id: The lowercase 4-character PDB ID
+            file_format: Format to download (pdb, cif, xml, etc.)
+
+        Returns:
+            Tuple of (output file path, download URL)
+        """
         # Determine correct file extension and URL extension
         if file_format == "pdb":
             file_ext = "pdb"  # Changed from "ent" to "pdb" for local storage
@@ -88,114 +277,379 @@ class PDBCollector:
         else:
             file_ext = file_format
             url_ext = file_format
-        
+
+        # Fetch the compressed variant where available; it is inflated while
+        # streaming, so the stored file is the same as before
+        if file_format in GZIP_FORMATS:
+            url_ext += ".gz"
+
         output_file = self.output_dir / f"{pdb_id}.{file_ext}"
+        url = f"{self.DOWNLOAD_URL}/{pdb_id}.{url_ext}"
+        return output_file, url
+
+    @staticmethod
+    def _decompressor(url: str):
+        """
+        Create a streaming gzip decompressor for compressed download URLs.
+
+        Args:
+            url: Download URL returned by _download_target
+
+        Returns:
+            zlib decompression object, or None if the URL is not compressed
+        """
+        return zlib.decompressobj(GZIP_WBITS) if url.endswith(".gz") else None
+
+    async def _download_pdb_async(
+        self, session: aiohttp.ClientSession, pdb_id: str, file_format: str = "pdb"
+    ) -> Optional[Path]:
+        """
+        Download a PDB file asynchronously, streaming it to disk.
+
+        Args:
+            session: Shared aiohttp session
+            pdb_id: The 4-character PDB ID
+            file_format: Format to download (pdb, cif, xml, etc.)
+
+        Returns:
+            Path to the downloaded file or None if download failed
+        """
+        pdb_id = pdb_id.lower()
+        output_file, url = self._download_target(pdb_id, file_format)
 
         # Skip if file already exists
         if output_file.exists():
             logger.debug(f"File {output_file} already exists, skipping download")
             return output_file
 
+        # Write to a temporary file so an interrupted download is never
+        # mistaken for a complete one on the next run
+        partial_file = output_file.with_name(output_file.name + ".part")
         try:
-            url = f"{self.DOWNLOAD_URL}/{pdb_id}.{url_ext}"
             logger.debug(f"Downloading from URL: {url}")
-            
-            response = requests.get(url)
-            response.raise_for_status()
-
-            with open(output_file, "wb") as f:
-                f.write(response.content)
-
+            async with session.get(url) as response:
+                response.raise_for_status()
+                decompressor = self._decompressor(url)
+                with open(partial_file, "wb") as f:
+                    async for chunk in response.content.iter_chunked(
+                        DOWNLOAD_CHUNK_SIZE
+                    ):
+                        if decompressor:
+                            chunk = decompressor.decompress(chunk)
+                        f.write(chunk)
+                    if decompressor:
+                        f.write(decompressor.flush())
+
+            partial_file.replace(output_file)
             logger.info(f"Downloaded {pdb_id} to {output_file}")
             return output_file
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError, zlib.error) as e:
+            partial_file.unlink(missing_ok=True)
             logger.error(f"Error downloading {pdb_id}: {e}")
             return None
 
+    async def _get_metadata_async(
+        self, session: aiohttp.ClientSession, pdb_id: str
+    ) -> Dict:
+        """
+        Fetch metadata for a PDB entry asynchronously.
+
+        Args:
+            session: Shared aiohttp session
+            pdb_id: The 4-character PDB ID
+
+        Returns:
+            Dictionary containing metadata
+        """
+        cached = self._load_cached_metadata(pdb_id)
+        try:
+            url = f"{self.BASE_URL}/entry/{pdb_id}"
+            async with session.get(
+                url, headers=self._conditional_headers(cached)
+            ) as response:
+                # Unchanged since the last fetch: reuse the cached body
+                if response.status == 304 and cached:
+                    return cached["body"]
+
+                response.raise_for_status()
+                metadata = orjson.loads(await response.read())
+                self._store_cached_metadata(pdb_id, response.headers, metadata)
+                return metadata
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching metadata for {pdb_id}: {e}")
+            return {}
+
+    async def _get_metadata_batch_async(
+        self, session: aiohttp.ClientSession, pdb_ids: List[str]
+    ) -> Dict[str, Dict]:
+        """
+        Fetch metadata for several PDB entries with one GraphQL request.
+
+        Args:
+            session: Shared aiohttp session
+            pdb_ids: PDB IDs to fetch (at most one batch)
+
+        Returns:
+            Raw metadata keyed by the requested PDB IDs; falls back to one REST
+            request per entry if the GraphQL request fails
+        """
+        try:
+            async with session.post(
+                self.GRAPHQL_URL,
+                data=self._graphql_body(pdb_ids),
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                response.raise_for_status()
+                return self._parse_graphql_entries(
+                    pdb_ids, orjson.loads(await response.read())
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"GraphQL metadata request failed, using REST: {e}")
+
+        metadata = await asyncio.gather(
+            *(self._get_metadata_async(session, pdb_id) for pdb_id in pdb_ids)
+        )
+        return dict(zip(pdb_ids, metadata))
+
     def batch_download(
         self,
         pdb_ids: List[str],
         file_format: str = "pdb",
         max_retries: int = 3,
         delay: float = 0.5,
-        collect_metadata: bool = True
+        collect_metadata: bool = True,
+        max_concurrency: int = MAX_CONCURRENT_DOWNLOADS,
+        skip_existing: bool = True,
+        metadata_batch_size: int = METADATA_BATCH_SIZE,
     ) -> List[Path]:
         """
-        Download multiple PDB files with retries and rate limiting.
+        Download multiple PDB files concurrently with retries.
 
         Args:
             pdb_ids: List of PDB IDs to download
             file_format: Format to download files in
             max_retries: Maximum number of retry attempts for failed downloads
-            delay: Delay between requests in seconds
+            delay: Base delay in seconds for the backoff between retries
             collect_metadata: Whether to collect metadata during download
+            max_concurrency: Maximum number of entries fetched at once
+            skip_existing: Reuse entries whose file and metadata were saved
+                by a previous run instead of fetching them again
+            metadata_batch_size: Number of entries per metadata request
 
         Returns:
             List of paths to successfully downloaded files
         """
-        downloaded_files = []
+        return asyncio.run(
+            self.batch_download_async(
+                pdb_ids,
+                file_format=file_format,
+                max_retries=max_retries,
+                delay=delay,
+                collect_metadata=collect_metadata,
+                max_concurrency=max_concurrency,
+                skip_existing=skip_existing,
+                metadata_batch_size=metadata_batch_size,
+            )
+        )
+
+    async def batch_download_async(
+        self,
+        pdb_ids: List[str],
+        file_format: str = "pdb",
+        max_retries: int = 3,
+        delay: float = 0.5,
+        collect_metadata: bool = True,
+        max_concurrency: int = MAX_CONCURRENT_DOWNLOADS,
+        skip_existing: bool = True,
+        metadata_batch_size: int = METADATA_BATCH_SIZE,
+    ) -> List[Path]:
+        """
+        Download multiple PDB files concurrently over one connection pool.
+
+        Args:
+            pdb_ids: List of PDB IDs to download
+            file_format: Format to download files in
+            max_retries: Maximum number of retry attempts for failed downloads
+            delay: Base delay in seconds for the backoff between retries
+            collect_metadata: Whether to collect metadata during download
+            max_concurrency: Maximum number of entries fetched at once
+            skip_existing: Reuse entries whose file and metadata were saved
+                by a previous run instead of fetching them again
+            metadata_batch_size: Number of entries per metadata request
+
+        Returns:
+            List of paths to successfully downloaded files, in input order
+        """
         total = len(pdb_ids)
         
         logger.info(f"Starting batch download of {total} PDB files in {file_format} format")
         
         # If collecting metadata, prepare dictionary and directory
         metadata_dict = {}
+        saved_metadata = {}
+        downloaded = set()
+        checkpoint = None
         if collect_metadata:
             logger.info("Metadata collection enabled")
             metadata_dir = Path("data/processed")
             metadata_dir.mkdir(parents=True, exist_ok=True)
-        
-        for idx, pdb_id in enumerate(pdb_ids, 1):
-            success = False
-            
-            for attempt in range(max_retries):
-                file_path = self.download_pdb(pdb_id, file_format)
-                if file_path:
-                    downloaded_files.append(file_path)
-                    success = True
-                    
-                    # Collect metadata if enabled
-                    if collect_metadata:
-                        try:
-                            logger.debug(f"Fetching metadata for {pdb_id}")
-                            metadata = self.get_metadata(pdb_id)
-                            if metadata:
-                                # Process and store essential metadata
-                                processed_metadata = self._process_metadata(pdb_id, metadata)
-                                metadata_dict[pdb_id] = processed_metadata
-                        except Exception as e:
-                            logger.error(f"Error collecting metadata for {pdb_id}: {e}")
-                    
-                    break
-                    
-                logger.warning(f"Retry {attempt + 1}/{max_retries} for {pdb_id}")
-                time.sleep(delay * (attempt + 1))  # Exponential backoff
-            
-            if not success:
+
+            # Entries whose file and metadata are both on disk from an earlier
+            # (possibly interrupted) run are reused without any requests
+            if skip_existing:
+                saved_metadata = self._load_saved_metadata(metadata_dir)
+                downloaded = {path.name for path in self.output_dir.iterdir()}
+
+            # Append one record per entry as it arrives, so progress is kept
+            # without rewriting the whole collection at every checkpoint
+            checkpoint = open(metadata_dir / "metadata.ndjson", "wb", buffering=1 << 20)
+
+        # The semaphore bounds in-flight entries, replacing the fixed sleep
+        # between sequential requests
+        semaphore = asyncio.Semaphore(max_concurrency)
+        completed = 0
+
+        async def fetch(session: aiohttp.ClientSession, pdb_id: str) -> Optional[Path]:
+            nonlocal completed
+            file_path = None
+            output_file, _ = self._download_target(pdb_id.lower(), file_format)
+            if pdb_id in saved_metadata and output_file.name in downloaded:
+                logger.debug(f"{pdb_id} already downloaded with metadata, skipping")
+                metadata_dict[pdb_id] = saved_metadata[pdb_id]
+                checkpoint.write(
+                    orjson.dumps({"pdb_id": pdb_id, **metadata_dict[pdb_id]}) + b"\n"
+                )
+                file_path = output_file
+
+            async with semaphore:
+                for attempt in range(0 if file_path else max_retries):
+                    file_path = await self._download_pdb_async(
+                        session, pdb_id, file_format
+                    )
+                    if file_path:
+                        break
+
+                    logger.warning(f"Retry {attempt + 1}/{max_retries} for {pdb_id}")
+                    await asyncio.sleep(delay * (attempt + 1))  # Linear backoff
+
+            if not file_path:
                 logger.error(f"Failed to download {pdb_id} after {max_retries} attempts")
-            
+
             # Log progress periodically
-            if idx % 10 == 0 or idx == total:
-                logger.info(f"Progress: {idx}/{total} ({idx/total:.1%})")
-                
-                # Save metadata periodically to avoid losing progress
-                if collect_metadata and metadata_dict:
-                    with open("data/processed/metadata.json", "w") as f:
-                        json.dump(metadata_dict, f, indent=2)
-                    logger.info(f"Saved metadata for {len(metadata_dict)} structures")
-                
-            time.sleep(delay)  # Rate limiting between requests
+            completed += 1
+            if completed % 10 == 0 or completed == total:
+                logger.info(f"Progress: {completed}/{total} ({completed/total:.1%})")
+
+            return file_path
+
+        async def fetch_metadata(session: aiohttp.ClientSession, batch: List[str]):
+            async with semaphore:
+                try:
+                    logger.debug(f"Fetching metadata for {len(batch)} entries")
+                    raw_metadata = await self._get_metadata_batch_async(session, batch)
+                except Exception as e:
+                    logger.error(f"Error collecting metadata for {batch}: {e}")
+                    return
+
+            for pdb_id in batch:
+                if raw_metadata.get(pdb_id):
+                    # Process and store essential metadata
+                    metadata_dict[pdb_id] = self._process_metadata(
+                        pdb_id, raw_metadata[pdb_id]
+                    )
+                    checkpoint.write(
+                        orjson.dumps({"pdb_id": pdb_id, **metadata_dict[pdb_id]})
+                        + b"\n"
+                    )
+
+            # Flush the checkpoint after each batch to avoid losing progress
+            checkpoint.flush()
+
+        connector = aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=16)
+        timeout = aiohttp.ClientTimeout(total=300, sock_connect=30)
+        try:
+            async with aiohttp.ClientSession(
+                connector=connector, timeout=timeout
+            ) as session:
+                results = await asyncio.gather(
+                    *(fetch(session, pdb_id) for pdb_id in pdb_ids)
+                )
 
+                # Fetch metadata for the new downloads in GraphQL batches
+                # rather than one REST request per entry
+                if collect_metadata:
+                    pending = [
+                        pdb_id
+                        for pdb_id, path in zip(pdb_ids, results)
+                        if path and pdb_id not in metadata_dict
+                    ]
+                    batches = [
+                        pending[i : i + metadata_batch_size]
+                        for i in range(0, len(pending), metadata_batch_size)
+                    ]
+                    await asyncio.gather(
+                        *(fetch_metadata(session, batch) for batch in batches)
+                    )
+        finally:
+            if checkpoint:
+                checkpoint.close()
+
+        downloaded_files = [path for path in results if path]
         logger.info(f"Batch download complete. Downloaded {len(downloaded_files)}/{total} files")
         
-        # Save final metadata
+        # Save the consolidated metadata once at the end
         if collect_metadata and metadata_dict:
-            with open("data/processed/metadata.json", "w") as f:
-                json.dump(metadata_dict, f, indent=2)
+            self._save_metadata(metadata_dict, pdb_ids)
             logger.info(f"Metadata collection complete. Saved metadata for {len(metadata_dict)} structures")
         
         return downloaded_files
 
+    @staticmethod
+    def _load_saved_metadata(metadata_dir: Path) -> Dict:
+        """
+        Load processed metadata written by earlier batch downloads.
+
+        Args:
+            metadata_dir: Directory holding metadata.json and metadata.ndjson
+
+        Returns:
+            Processed metadata keyed by PDB ID; checkpoint records from an
+            interrupted run take precedence over the consolidated file
+        """
+        saved = {}
+        consolidated = metadata_dir / "metadata.json"
+        if consolidated.exists():
+            try:
+                saved.update(orjson.loads(consolidated.read_bytes()))
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"Ignoring unreadable {consolidated}: {e}")
+
+        checkpoint = metadata_dir / "metadata.ndjson"
+        if checkpoint.exists():
+            with open(checkpoint, "rb") as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue  # Partially written last line
+                    saved[record.pop("pdb_id")] = record
+        return saved
+
+    @staticmethod
+    def _save_metadata(metadata_dict: Dict, pdb_ids: List[str]):
+        """
+        Write collected metadata to disk, ordered like the requested PDB IDs.
+
+        Args:
+            metadata_dict: Processed metadata keyed by PDB ID
+            pdb_ids: PDB IDs in the order they were requested
+        """
+        ordered = {
+            pdb_id: metadata_dict[pdb_id] for pdb_id in pdb_ids if pdb_id in metadata_dict
+        }
+        with open("data/processed/metadata.json", "wb") as f:
+            f.write(orjson.dumps(ordered, option=orjson.OPT_INDENT_2))
+
     def _process_metadata(self, pdb_id: str, raw_metadata: Dict) -> Dict:
         """
         Process raw metadata into a format useful for categorization.
@@ -224,16 +678,11 @@ class PDBCollector:
             if "rcsb_struct_class" in raw_metadata:
                 processed["classification"] = raw_metadata["rcsb_struct_class"]
                 
-            if "refine" in raw_metadata and len(raw_metadata["refine"]) > 0:
-                processed["resolution"] = raw_metadata["refine"][0].get("ls_dres_high")
-                processed["r_factor"] = raw_metadata["refine"][0].get("ls_rfactor_obs")
-                processed["r_free"] = raw_metadata["refine"][0].get("ls_rfactor_rfree")
-
-            if "exptl" in raw_metadata and len(raw_metadata["exptl"]) > 0:
-                processed["experimental_method"] = raw_metadata["exptl"][0].get("method")
-                
-            if "diffrn" in raw_metadata and len(raw_metadata["diffrn"]) > 0:
-                processed["temperature"] = raw_metadata["diffrn"][0].get("ambient_temp")
+            # Scalar fields read from the first entry of a metadata section
+            for key, section, field in FIRST_ENTRY_FIELDS:
+                entries = raw_metadata.get(section)
+                if entries:
+                    processed[key] = entries[0].get(field)
 
             if "citation" in raw_metadata and len(raw_metadata["citation"]) > 0:
                 citation = raw_metadata["citation"][0]
@@ -291,15 +740,163 @@ class PDBCollector:
         Returns:
             Dictionary containing metadata
         """
+        cached = self._load_cached_metadata(pdb_id)
         try:
             url = f"{self.BASE_URL}/entry/{pdb_id}"
-            response = requests.get(url)
+            response = self._session.get(
+                url, headers=self._conditional_headers(cached)
+            )
+
+            # Unchanged since the last fetch: reuse the cached body
+            if response.status_code == 304 and cached:
+                return cached["body"]
+
             response.raise_for_status()
-            return response.json()
+            metadata = orjson.loads(response.content)
+            self._store_cached_metadata(pdb_id, response.headers, metadata)
+            return metadata
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching metadata for {pdb_id}: {e}")
             return {}
 
+    def get_metadata_batch(
+        self, pdb_ids: List[str], batch_size: int = METADATA_BATCH_SIZE
+    ) -> Dict[str, Dict]:
+        """
+        Fetch metadata for many PDB entries using batched GraphQL requests.
+
+        Args:
+            pdb_ids: PDB IDs to fetch
+            batch_size: Number of entries per GraphQL request
+
+        Returns:
+            Raw metadata keyed by PDB ID, in the shape returned by get_metadata
+        """
+        metadata = {}
+        for i in range(0, len(pdb_ids), batch_size):
+            batch = pdb_ids[i : i + batch_size]
+            try:
+                response = self._session.post(
+                    self.GRAPHQL_URL,
+                    data=self._graphql_body(batch),
+                    headers={"Content-Type": "application/json"},
+                )
+                response.raise_for_status()
+                metadata.update(
+                    self._parse_graphql_entries(batch, orjson.loads(response.content))
+                )
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"GraphQL metadata request failed, using REST: {e}")
+                for pdb_id in batch:
+                    metadata[pdb_id] = self.get_metadata(pdb_id)
+        return metadata
+
+    @staticmethod
+    def _graphql_body(pdb_ids: List[str]) -> bytes:
+        """Serialise the entry metadata query for a batch of PDB IDs."""
+        return orjson.dumps(
+            {
+                "query": ENTRY_METADATA_QUERY,
+                "variables": {"ids": [pdb_id.upper() for pdb_id in pdb_ids]},
+            }
+        )
+
+    @staticmethod
+    def _parse_graphql_entries(pdb_ids: List[str], body: Dict) -> Dict[str, Dict]:
+        """
+        Convert a GraphQL entries response into REST-shaped metadata.
+
+        Args:
+            pdb_ids: PDB IDs that were requested
+            body: Decoded GraphQL response
+
+        Returns:
+            Raw metadata keyed by the requested PDB IDs; missing entries map
+            to an empty dictionary
+
+        Raises:
+            ValueError: If the response reports errors
+        """
+        if body.get("errors") or not body.get("data"):
+            raise ValueError(f"GraphQL errors: {body.get('errors')}")
+
+        entries = {}
+        for entry in body["data"].get("entries") or []:
+            if not entry:
+                continue
+
+            # The REST endpoint omits absent fields where GraphQL returns null
+            entry = _drop_nulls(entry)
+            for polymer_entity in entry.pop("polymer_entities", []):
+                for section in POLYMER_ENTITY_SECTIONS:
+                    entry.setdefault(section, []).extend(
+                        polymer_entity.get(section, [])
+                    )
+            entries[entry.pop("rcsb_id", "").upper()] = entry
+
+        return {pdb_id: entries.get(pdb_id.upper(), {}) for pdb_id in pdb_ids}
+
+    def _load_cached_metadata(self, pdb_id: str) -> Optional[Dict]:
+        """
+        Load the cached metadata response for a PDB entry.
+
+        Args:
+            pdb_id: The 4-character PDB ID
+
+        Returns:
+            Dictionary with 'etag', 'last_modified' and 'body', or None
+        """
+        cache_file = self.metadata_cache_dir / f"{pdb_id.lower()}.json"
+        try:
+            with open(cache_file, "rb") as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached_metadata(self, pdb_id: str, headers, metadata: Dict):
+        """
+        Cache a metadata response with its validators for conditional GETs.
+
+        Args:
+            pdb_id: The 4-character PDB ID
+            headers: Response headers carrying ETag / Last-Modified
+            metadata: Parsed response body
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        cache_file = self.metadata_cache_dir / f"{pdb_id.lower()}.json"
+        try:
+            with open(cache_file, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        {"etag": etag, "last_modified": last_modified, "body": metadata}
+                    )
+                )
+        except OSError as e:
+            logger.warning(f"Could not cache metadata for {pdb_id}: {e}")
+
+    @staticmethod
+    def _conditional_headers(cached: Optional[Dict]) -> Dict:
+        """
+        Build If-None-Match / If-Modified-Since headers from a cached response.
+
+        Args:
+            cached: Cached metadata entry, or None
+
+        Returns:
+            Request headers (empty if nothing is cached)
+        """
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
     @staticmethod
     def create_query_for_protein_ligand_complexes(
         resolution_cutoff: float = 2.5, has_ligands: bool = True
@@ -314,54 +911,14 @@ class PDBCollector:
         Returns:
             Query dictionary for the RCSB Search API
         """
+        nodes = [PROTEIN_POLYMER_NODE, _resolution_node(resolution_cutoff)]
+        if has_ligands:
+            nodes.append(BINDING_AFFINITY_NODE)
+
         query = {
-            "query": {
-                "type": "group",
-                "logical_operator": "and",
-                "nodes": [
-                    {
-                        "type": "terminal",
-                        "service": "text",
-                        "parameters": {
-                            "attribute": "entity_poly.rcsb_entity_polymer_type",
-                            "operator": "exact_match",
-                            "value": "Protein",
-                        },
-                    },
-                    {
-                        "type": "terminal",
-                        "service": "text",
-                        "parameters": {
-                            "attribute": "rcsb_entry_info.resolution_combined",
-                            "operator": "less_or_equal",
-                            "value": resolution_cutoff,
-                        },
-                    },
-                ],
-            },
+            "query": {"type": "group", "logical_operator": "and", "nodes": nodes},
             "return_type": "entry",
-            "request_options": {
-                "paginate": {"start": 0, "rows": 1000},
-                "scoring_strategy": "combined",
-                "sort": [
-                    {
-                        "sort_by": "rcsb_entry_info.resolution_combined",
-                        "direction": "asc",
-                    }
-                ],
-            },
+            "request_options": SEARCH_REQUEST_OPTIONS,
         }
 
-        if has_ligands:
-            query["query"]["nodes"].append(
-                {
-                    "type": "terminal",
-                    "service": "text",
-                    "parameters": {
-                        "attribute": "rcsb_binding_affinity.value",
-                        "operator": "exists",
-                    },
-                }
-            )
-
         return query
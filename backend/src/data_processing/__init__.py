@@ -1,11 +1,36 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 from Bio.PDB import MMCIFParser, PDBParser, Select
 from Bio.PDB.Structure import Structure
 from loguru import logger
 
+# Columns of processed_structures.csv, in the order they are written
+PROCESSED_COLUMNS = [
+    "pdb_id",
+    "status",
+    "num_models",
+    "num_chains",
+    "chains",
+    "num_ligands",
+    "ligands",
+]
+
+# Per-structure nested columns that are written out but not kept in memory
+NESTED_COLUMNS = ("chains", "ligands")
+
+# Residue names of water molecules, which are never treated as ligands
+WATER_RESNAMES = frozenset({"HOH", "WAT", "DOD"})
+
+# Parsers shared by every processor in the process. Biopython parsers are not
+# reentrant, which is fine here because batch work is split across processes
+_pdb_parser = PDBParser(QUIET=True)
+_mmcif_parser = MMCIFParser(QUIET=True)
+
 
 class PDBProcessor:
     """
@@ -21,8 +46,8 @@ class PDBProcessor:
         """
         self.processed_dir = Path(processed_dir)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
-        self.pdb_parser = PDBParser(QUIET=True)
-        self.mmcif_parser = MMCIFParser(QUIET=True)
+        self.pdb_parser = _pdb_parser
+        self.mmcif_parser = _mmcif_parser
         logger.info(
             f"PDB Processor initialized. Output directory: {self.processed_dir}"
         )
@@ -65,24 +90,26 @@ class PDBProcessor:
         for model in structure:
             for chain in model:
                 for residue in chain:
-                    # Check if residue is a hetero residue (ligand)
-                    if residue.id[0] and residue.id[0] != " ":
-                        # Skip water molecules
-                        if residue.get_resname() == "HOH":
-                            continue
-
-                        # Get ligand coordinates
-                        coords = [atom.get_coord() for atom in residue]
-                        center = sum(coords) / len(coords) if coords else None
-
-                        ligand_info = {
-                            "ligand_id": residue.id,
-                            "residue_name": residue.get_resname(),
-                            "chain_id": chain.id,
-                            "num_atoms": len(residue),
-                            "center": center.tolist() if center is not None else None,
-                        }
-                        ligands.append(ligand_info)
+                    # Only hetero residues other than water are ligands
+                    hetflag = residue.id[0]
+                    if hetflag == " " or residue.resname in WATER_RESNAMES:
+                        continue
+
+                    # Get ligand coordinates; summing along the atom axis
+                    # in NumPy matches the old per-atom sum exactly
+                    center = None
+                    if len(residue):
+                        coords = np.array([atom.coord for atom in residue])
+                        center = coords.sum(axis=0) / len(coords)
+
+                    ligand_info = {
+                        "ligand_id": residue.id,
+                        "residue_name": residue.resname,
+                        "chain_id": chain.id,
+                        "num_atoms": len(residue),
+                        "center": center.tolist() if center is not None else None,
+                    }
+                    ligands.append(ligand_info)
 
         return ligands
 
@@ -100,15 +127,25 @@ class PDBProcessor:
 
         for model in structure:
             for chain in model:
-                # Count residues and check if it's a protein chain
-                residues = [r for r in chain if r.id[0] == " "]
-                if not residues:
+                # Count standard residues and track the first/last residue
+                # numbers in one pass instead of building a list per chain
+                count = 0
+                first_id = last_id = None
+                for residue in chain:
+                    residue_id = residue.id
+                    if residue_id[0] == " ":
+                        if count == 0:
+                            first_id = residue_id[1]
+                        last_id = residue_id[1]
+                        count += 1
+
+                if not count:
                     continue
 
                 chain_info = {
                     "chain_id": chain.id,
-                    "length": len(residues),
-                    "residue_range": f"{residues[0].id[1]}-{residues[-1].id[1]}",
+                    "length": count,
+                    "residue_range": f"{first_id}-{last_id}",
                 }
                 chains.append(chain_info)
 
@@ -135,12 +172,13 @@ class PDBProcessor:
         # Extract information
         ligands = self.extract_ligands(structure)
         chains = self.extract_protein_chains(structure)
+        num_models = len(structure)
 
         # Compile results
         result = {
             "pdb_id": pdb_id,
             "status": "processed",
-            "num_models": len(structure),
+            "num_models": num_models,
             "num_chains": len(chains),
             "chains": chains,
             "num_ligands": len(ligands),
@@ -149,30 +187,63 @@ class PDBProcessor:
 
         return result
 
-    def batch_process(self, file_paths: List[Union[str, Path]]) -> pd.DataFrame:
+    def batch_process(
+        self,
+        file_paths: List[Union[str, Path]],
+        max_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
         """
-        Process multiple PDB files and compile results into a DataFrame.
+        Process multiple PDB files and stream the results to a CSV file.
 
         Args:
             file_paths: List of paths to PDB files
+            max_workers: Number of worker processes (defaults to CPU count)
 
         Returns:
-            DataFrame with processed information
+            DataFrame summarising each file; the nested chain and ligand
+            lists are only written to processed_structures.csv
         """
-        results = []
-
-        for file_path in file_paths:
-            logger.info(f"Processing {file_path}")
-            result = self.process_pdb_file(file_path)
-            results.append(result)
-
-        # Convert to DataFrame and save
-        df = pd.DataFrame(results)
         output_file = self.processed_dir / "processed_structures.csv"
-        df.to_csv(output_file, index=False)
+        summaries = []
+
+        # Files are parsed independently, so spread the CPU-bound parsing
+        # across processes; each worker builds its own processor once.
+        # Rows are written as they arrive, so the full nested results are
+        # never held in memory together
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_process_worker,
+            initargs=(str(self.processed_dir),),
+        ) as executor, open(output_file, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=PROCESSED_COLUMNS, lineterminator="\n"
+            )
+            writer.writeheader()
+            for result in executor.map(_process_one, file_paths, chunksize=16):
+                writer.writerow(result)
+                summaries.append(
+                    {k: v for k, v in result.items() if k not in NESTED_COLUMNS}
+                )
+
         logger.info(f"Saved processed data to {output_file}")
 
-        return df
+        return pd.DataFrame(summaries)
+
+
+# Processor owned by each process-pool worker, created once per process
+_worker_processor = None
+
+
+def _init_process_worker(processed_dir: str):
+    """Create the worker's processor (and its parsers) once."""
+    global _worker_processor
+    _worker_processor = PDBProcessor(processed_dir)
+
+
+def _process_one(file_path: Union[str, Path]) -> Dict:
+    """Process a single PDB file inside a worker process."""
+    logger.info(f"Processing {file_path}")
+    return _worker_processor.process_pdb_file(file_path)
 
 
 class LigandExtractor(Select):
@@ -4,6 +4,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -20,6 +21,10 @@ protein_category_association = Table(
     Base.metadata,
     Column("protein_id", Integer, ForeignKey("proteins.id")),
     Column("category_id", Integer, ForeignKey("protein_categories.id")),
+    # Serves protein-side lookups and keeps each pair linked only once
+    Index("ix_pca_pair", "protein_id", "category_id", unique=True),
+    # Serves category filters, already ordered by protein for keyset paging
+    Index("ix_pca_category_protein", "category_id", "protein_id"),
 )
 
 
@@ -29,7 +34,7 @@ class Protein(Base):
     __tablename__ = "proteins"
 
     id = Column(Integer, primary_key=True)
-    status = Column(String)  # 'processed', 'failed', 'pending'
+    status = Column(String, index=True)  # 'processed', 'failed', 'pending'
     pdb_id = Column(String, unique=True, index=True)
     title = Column(String)
     quality = Column(String)
@@ -41,7 +46,10 @@ class Protein(Base):
     chain_data = Column(JSON)  # Chain IDs, lengths, etc.
 
     # Relationships
-    ligands = relationship("Ligand", back_populates="protein")
+    # lazy="raise" forces callers to eager-load ligands instead of issuing N+1 queries
+    ligands = relationship(
+        "Ligand", back_populates="protein", lazy="raise", order_by="Ligand.id"
+    )
     categories = relationship("ProteinCategory", secondary=protein_category_association)
     ipfs_hashes = relationship("ProteinIPFS", back_populates="protein")
 
@@ -55,7 +63,7 @@ class Ligand(Base):
     __tablename__ = "ligands"
 
     id = Column(Integer, primary_key=True)
-    protein_id = Column(Integer, ForeignKey("proteins.id"))
+    protein_id = Column(Integer, ForeignKey("proteins.id"), index=True)
     residue_name = Column(String)
     chain_id = Column(String)
     residue_id = Column(String)
@@ -66,7 +74,7 @@ class Ligand(Base):
 
     # Binding site properties
     binding_site_data = Column(JSON)
-    binding_metrics = Column(JSON)
+    binding_metrics = Column(JSON(none_as_null=True))
 
     # Relationships
     protein = relationship("Protein", back_populates="ligands")
@@ -92,7 +100,9 @@ class ProteinIPFS(Base):
     __tablename__ = "protein_ipfs"
     
     id = Column(Integer, primary_key=True, index=True)
-    protein_pdb_id = Column(String, ForeignKey("proteins.pdb_id"), nullable=False)
+    protein_pdb_id = Column(
+        String, ForeignKey("proteins.pdb_id"), nullable=False, index=True
+    )
     ipfs_hash = Column(String, nullable=False)
     
     # Define the relationship to the Protein model
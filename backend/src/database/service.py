@@ -1,12 +1,18 @@
 import ast
-import json
+import os
+import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import orjson
 import pandas as pd
 from loguru import logger
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, delete, event, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, raiseload, selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from .models import (
     Base,
@@ -16,45 +22,296 @@ from .models import (
     protein_category_association,
 )
 
+# SQLite database used when no URL is given: backend/data/docking_db.sqlite
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / "data" / "docking_db.sqlite"
+
+# Number of CSV rows written per group of bulk statements during import
+IMPORT_BATCH_SIZE = 1000
+
+# Rows read from the enhanced CSV per chunk, the columns the import reads and
+# the dtypes of its text columns
+IMPORT_CSV_CHUNK_SIZE = 5000
+IMPORT_CSV_COLUMNS = (
+    "pdb_id",
+    "title",
+    "num_chains",
+    "status",
+    "chains",
+    "experimental_quality",
+    "experimental_conditions",
+    "protein_families",
+    "binding_metrics",
+    "ligands",
+    "enhanced_ligands",
+)
+IMPORT_CSV_DTYPES = {
+    "pdb_id": str,
+    "title": str,
+    "status": str,
+    "experimental_quality": str,
+}
+
+# Values bound per IN clause; older SQLite builds cap a statement at 999
+# parameters
+IN_CLAUSE_CHUNK_SIZE = 900
+
+# Loader options for Protein objects returned by the getters: categories and
+# ligands come with one extra SELECT ... IN each, so they stay usable once
+# detached, and any other relationship raises instead of lazy loading
+PROTEIN_LOAD_OPTIONS = (
+    selectinload(Protein.categories),
+    selectinload(Protein.ligands),
+    raiseload("*"),
+)
 
-class DatabaseService:
+# Ligand columns the ligand update methods may set; the primary key is
+# excluded so an update can never move a row
+LIGAND_PROPERTY_COLUMNS = frozenset(
+    column.name for column in Ligand.__table__.columns if not column.primary_key
+)
+
+# Enhanced-CSV columns holding JSON written with Python-style single quotes
+QUOTED_JSON_COLUMNS = (
+    "chains",
+    "protein_families",
+    "experimental_conditions",
+    "binding_metrics",
+    "ligands",
+    "enhanced_ligands",
+)
+
+# Translation table turning the single-quoted JSON written to the CSVs into
+# valid JSON
+_QUOTE_FIX = str.maketrans("'", '"')
+
+# Python literals written by str() of a dict and their JSON spellings
+_PY_LITERALS = re.compile(r"\b(None|True|False)\b")
+_PY_TO_JSON = {"None": "null", "True": "true", "False": "false"}
+
+
+def _loads_quoted(value: Any) -> Any:
     """
-    Service for interacting with the application database.
+    Parse a JSON cell written with single quotes.
+
+    Args:
+        value: Raw CSV cell
+
+    Returns:
+        Parsed value, or None if the cell is not a string or not valid JSON
     """
+    if not isinstance(value, str):
+        return None
+    try:
+        return orjson.loads(value.translate(_QUOTE_FIX))
+    except ValueError:
+        return None
 
-    def get_db_path():
-        """Ensures the database directory exists and returns the full path"""
-        db_dir = Path("/home/kshitij/dev/data-management/backend/data")
-        db_dir.mkdir(parents=True, exist_ok=True)
-        return str(db_dir / "docking_db.sqlite")
 
-    # Then when creating your engine, use:
-    engine = create_engine(
-        f"sqlite:///{get_db_path()}", connect_args={"check_same_thread": False}
+def _loads_python_literal(value: str) -> Any:
+    """
+    Parse the str() of a Python container as JSON.
+
+    Args:
+        value: Python literal using single quotes and None/True/False
+
+    Returns:
+        Parsed value
+
+    Raises:
+        orjson.JSONDecodeError: If the normalized text is not valid JSON
+    """
+    return orjson.loads(
+        _PY_LITERALS.sub(
+            lambda match: _PY_TO_JSON[match.group()], value.translate(_QUOTE_FIX)
+        )
     )
 
-    def __init__(self, db_url: str = "sqlite:///./data/docking_db.sqlite"):
+
+def _quoted_json(row: Dict, column: str) -> Any:
+    """
+    Return the parsed JSON of a cell, using the column parsed up front.
+
+    Cells that did not parse are parsed again here so callers see the same
+    exception as a direct orjson.loads.
+
+    Args:
+        row: CSV row as a dictionary, including the parsed columns
+        column: Name of the raw column
+
+    Returns:
+        Parsed cell value
+    """
+    parsed = row.get(f"{column}_json")
+    if parsed is None:
+        parsed = orjson.loads(row[column].translate(_QUOTE_FIX))
+    return parsed
+
+
+def _query_in_chunks(query, column, values) -> Iterator:
+    """
+    Run a query filtered by column IN values, split into chunks that stay
+    under SQLite's bound-parameter limit.
+
+    Args:
+        query: Query to filter
+        column: Column matched against the values
+        values: Values to match
+
+    Returns:
+        Iterator over the rows of every chunk
+    """
+    values = list(values)
+    for start in range(0, len(values), IN_CLAUSE_CHUNK_SIZE):
+        yield from query.filter(
+            column.in_(values[start : start + IN_CLAUSE_CHUNK_SIZE])
+        )
+
+
+def chains_to_dict(chain_data: Any) -> Any:
+    """
+    Convert a list of chain records into a dictionary keyed by chain ID.
+
+    Args:
+        chain_data: Chain data as stored on a protein (list, dict or None)
+
+    Returns:
+        Dictionary mapping chain IDs to the remaining chain fields, or the
+        input unchanged if it is not a list
+    """
+    if not isinstance(chain_data, list):
+        return chain_data
+
+    return {
+        chain["chain_id"]: {k: v for k, v in chain.items() if k != "chain_id"}
+        for chain in chain_data
+        if chain.get("chain_id")
+    }
+
+
+# Connection settings for the SQLite database: WAL lets readers run alongside
+# the writer and, with synchronous=NORMAL, avoids an fsync on every commit
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to each new database connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _dumps_json(value: Any) -> str:
+    """
+    Serialize a JSON column value with orjson.
+
+    Non-string keys and numpy values are accepted, as json.dumps accepted the
+    former and the processing pipeline can produce the latter.
+
+    Args:
+        value: Value bound to a JSON column
+
+    Returns:
+        Serialized JSON text
+    """
+    return orjson.dumps(
+        value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+class DatabaseService:
+    """
+    Service for interacting with the application database.
+    """
+
+    def __init__(self, db_url: Optional[str] = None):
         """
         Initialize the database service.
 
         Args:
-            db_url: SQLAlchemy database URL
+            db_url: SQLAlchemy database URL. Defaults to the DATABASE_URL
+                    environment variable, then to the SQLite file in
+                    backend/data
         """
-        self.engine = self.engine  # Reference the class engine as instance attribute
+        db_url = db_url or os.environ.get("DATABASE_URL")
+        if not db_url:
+            DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            db_url = f"sqlite:///{DEFAULT_DB_PATH}"
+
+        # An in-memory database exists only on its connection, so it gets one
+        # connection shared by every thread and session
+        pool_args = {"poolclass": StaticPool}
+        if make_url(db_url).database not in (None, "", ":memory:"):
+            # Sized above FastAPI's 40-thread sync worker pool so concurrent
+            # requests never block waiting on a connection
+            pool_args = {"pool_size": 20, "max_overflow": 40}
+
+        self.engine = create_engine(
+            db_url,
+            connect_args={"check_same_thread": False},
+            # JSON columns are written in bulk during imports; orjson
+            # serializes them several times faster than the default json.dumps
+            json_serializer=_dumps_json,
+            **pool_args,
+        )
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
         logger.info(f"Database service initialized with {db_url}")
 
     def create_tables(self):
-        """Create all database tables if they don't exist."""
+        """Create all database tables and indexes if they don't exist."""
         Base.metadata.create_all(bind=self.engine)
+
+        # Older databases may link a protein to a category more than once,
+        # which would block the unique pair index below
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "DELETE FROM protein_category_association WHERE rowid NOT IN "
+                "(SELECT MIN(rowid) FROM protein_category_association "
+                "GROUP BY protein_id, category_id)"
+            )
+
+        # create_all skips tables that already exist, so indexes added to the
+        # models later have to be created explicitly on older databases
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
         logger.info("Database tables created")
 
     def get_session(self):
         """Get a database session."""
         return self.SessionLocal()
 
+    @contextmanager
+    def session_scope(self, session: Optional[Session] = None) -> Iterator[Session]:
+        """
+        Yield the caller's session, or a new one that is closed afterwards.
+
+        Args:
+            session: Optional session owned by the caller (e.g. request-scoped)
+        """
+        if session is not None:
+            yield session
+            return
+
+        session = self.get_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
     def import_enhanced_structures(self, csv_file_path: str):
         """
         Import enhanced structure data from CSV with specialized columns.
@@ -71,10 +328,16 @@ class DatabaseService:
             logger.error(f"CSV file not found: {csv_file_path}")
             return False
 
-        # Read CSV file
+        # Stream the CSV in chunks, reading only the columns the import uses.
+        # Text columns are read as str so IDs like "1E10" are not coerced to
+        # numbers; missing cells stay NaN so the pd.notna checks still apply
         try:
-            df = pd.read_csv(csv_file_path)
-            logger.info(f"Loaded {len(df)} structures from {csv_file_path}")
+            reader = pd.read_csv(
+                csv_file_path,
+                chunksize=IMPORT_CSV_CHUNK_SIZE,
+                usecols=lambda column: column in IMPORT_CSV_COLUMNS,
+                dtype=IMPORT_CSV_DTYPES,
+            )
         except Exception as e:
             logger.error(f"Error reading CSV file: {e}")
             return False
@@ -85,351 +348,560 @@ class DatabaseService:
             imported_count = 0
             updated_count = 0
 
-            # Process each row
-            for _, row in df.iterrows():
-                pdb_id = row["pdb_id"]
+            # Categories are few, so look them all up once; protein IDs are
+            # looked up per chunk. The batches keep both maps up to date
+            protein_ids: Dict[str, int] = {}
+            category_ids = dict(session.query(ProteinCategory.name, ProteinCategory.id))
+
+            for df in reader:
+                # Parse the JSON columns column-wise rather than cell by cell
+                # inside the row loop
+                for column in QUOTED_JSON_COLUMNS:
+                    if column in df.columns:
+                        df[f"{column}_json"] = df[column].map(_loads_quoted)
+
+                # Parse every row first so each batch below is written with a
+                # few multi-row statements instead of per-row ORM adds and
+                # flushes
+                records = [
+                    (row, self._parse_enhanced_row(row))
+                    for row in df.to_dict("records")
+                ]
+                logger.debug(f"Read {len(records)} structures from {csv_file_path}")
+
+                protein_ids.update(
+                    _query_in_chunks(
+                        session.query(Protein.pdb_id, Protein.id),
+                        Protein.pdb_id,
+                        {parsed["pdb_id"] for _, parsed in records}
+                        - protein_ids.keys(),
+                    )
+                )
 
-                # Check if protein already exists
-                existing = (
-                    session.query(Protein).filter(Protein.pdb_id == pdb_id).first()
+                # Write in batches to bound statement sizes, but commit once
+                # so the whole import is a single transaction and a failed
+                # import leaves the database untouched
+                for start in range(0, len(records), IMPORT_BATCH_SIZE):
+                    batch = records[start : start + IMPORT_BATCH_SIZE]
+                    imported, updated = self._write_enhanced_batch(
+                        session, batch, protein_ids, category_ids
+                    )
+                    imported_count += imported
+                    updated_count += updated
+                    logger.debug(f"Wrote batch of {len(batch)} proteins")
+
+            session.commit()
+
+            logger.info(
+                f"Database import complete: {imported_count} new proteins, {updated_count} updated"
+            )
+            return True
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error during database import: {e}")
+            return False
+        finally:
+            session.close()
+
+    def _write_enhanced_batch(
+        self,
+        session: Session,
+        batch: List[Tuple[Dict, Dict]],
+        protein_ids: Dict[str, int],
+        category_ids: Dict[str, int],
+    ) -> Tuple[int, int]:
+        """
+        Write a batch of parsed CSV rows using bulk statements.
+
+        Args:
+            session: Session the batch is written in
+            batch: List of (CSV row, parsed row) pairs
+            protein_ids: Stored protein IDs by PDB ID, updated with new rows
+            category_ids: Stored category IDs by name, updated with new rows
+
+        Returns:
+            Tuple of (new proteins, updated proteins)
+        """
+        preexisting = {
+            parsed["pdb_id"] for _, parsed in batch if parsed["pdb_id"] in protein_ids
+        }
+
+        # Insert proteins seen for the first time, in CSV order
+        new_rows = {}
+        for row, parsed in batch:
+            pdb_id = parsed["pdb_id"]
+            if pdb_id in protein_ids or pdb_id in new_rows:
+                logger.debug(f"Protein {pdb_id} already exists, updating...")
+            else:
+                new_rows[pdb_id] = self._build_protein_row(pdb_id, row)
+        if new_rows:
+            # Rows another writer added since the preload are left as they are,
+            # matching how proteins that already existed are treated
+            session.execute(
+                sqlite_insert(Protein).on_conflict_do_nothing(
+                    index_elements=[Protein.pdb_id]
+                ),
+                list(new_rows.values()),
+            )
+            protein_ids.update(
+                _query_in_chunks(
+                    session.query(Protein.pdb_id, Protein.id),
+                    Protein.pdb_id,
+                    new_rows,
                 )
-                if existing:
-                    logger.debug(f"Protein {pdb_id} already exists, updating...")
-                    protein = existing
-                    updated_count += 1
-                else:
-                    # Create new protein entry with enhanced data
-                    # Parse chains data safely
-                    try:
-                        chains_data = row["chains"]
-                        if isinstance(chains_data, str):
-                            chains_data = json.loads(chains_data.replace("'", '"'))
-                    except (json.JSONDecodeError, TypeError, KeyError) as e:
-                        chains_data = {}
-                        logger.warning(f"Could not parse chains data for {pdb_id}: {e}")
-
-                    # Parse experimental quality data safely
-                    exp_quality = {}
-                    if "experimental_quality" in row and pd.notna(
-                        row["experimental_quality"]
-                    ):
-                        exp_quality = {"quality_level": row["experimental_quality"]}
-                        logger.debug(
-                            f"Parsed experimental quality for {pdb_id}: {exp_quality}"
-                        )
+            )
 
-                    if "experimental_conditions" in row and pd.notna(
-                        row["experimental_conditions"]
-                    ):
-                        method = json.loads(
-                            row["experimental_conditions"].replace("'", '"')
-                        )
-                        exp_quality["structure_method"] = method.get("method", "")
-                        exp_quality["resolution"] = method.get("resolution", None)
-                        exp_quality["temperature"] = method.get("temperature", None)
-                        logger.debug(
-                            f"Parsed experimental conditions for {pdb_id}: {exp_quality}"
-                        )
+        self._link_categories(
+            session,
+            category_ids,
+            [
+                (protein_ids[parsed["pdb_id"]], family)
+                for _, parsed in batch
+                for family in parsed["families"]
+            ],
+        )
 
-                    # Create protein object
-                    protein = Protein(
-                        pdb_id=pdb_id,
-                        title=row.get("title", ""),
-                        description=f"Enhanced structure {pdb_id} from categorization pipeline",
-                        quality=exp_quality.get("quality_level", ""),
-                        temperature=exp_quality.get("temperature"),
-                        resolution=exp_quality.get("resolution"),
-                        experiment_type=exp_quality.get("structure_method", ""),
-                        num_chains=row.get("num_chains", 0),
-                        chain_data=chains_data,
-                        status=row.get("status", ""),
-                    )
-                    session.add(protein)
-                    session.flush()  # Get protein ID
-                    imported_count += 1
+        # Ligands of the last row carrying ligand data replace what is stored
+        ligands_by_protein = {
+            protein_ids[parsed["pdb_id"]]: parsed["ligands"]
+            for _, parsed in batch
+            if parsed["ligands"] is not None
+        }
+        replaced = [
+            protein_ids[pdb_id]
+            for pdb_id in preexisting
+            if protein_ids[pdb_id] in ligands_by_protein
+        ]
+        for start in range(0, len(replaced), IN_CLAUSE_CHUNK_SIZE):
+            session.execute(
+                delete(Ligand).where(
+                    Ligand.protein_id.in_(replaced[start : start + IN_CLAUSE_CHUNK_SIZE])
+                )
+            )
+
+        ligand_rows = [
+            {**ligand, "protein_id": protein_id}
+            for protein_id, ligands in ligands_by_protein.items()
+            for ligand in ligands
+        ]
+        if ligand_rows:
+            session.execute(insert(Ligand), ligand_rows)
+
+        return len(new_rows), len(batch) - len(new_rows)
+
+    def _link_categories(
+        self,
+        session: Session,
+        category_ids: Dict[str, int],
+        links: List[Tuple[int, str]],
+    ):
+        """
+        Attach categories to proteins, creating any missing categories.
 
-                # Add protein families/categories
-                if "protein_families" in row and pd.notna(row["protein_families"]):
+        Args:
+            session: Session the links are written in
+            category_ids: Stored category IDs by name, updated with new rows
+            links: List of (protein ID, category name) pairs
+        """
+        if not links:
+            return
+
+        names = dict.fromkeys(name for _, name in links)
+        missing = [name for name in names if name not in category_ids]
+        if missing:
+            session.execute(
+                sqlite_insert(ProteinCategory).on_conflict_do_nothing(
+                    index_elements=[ProteinCategory.name]
+                ),
+                [
+                    {"name": name, "description": f"Protein family: {name}"}
+                    for name in missing
+                ],
+            )
+            category_ids.update(
+                _query_in_chunks(
+                    session.query(ProteinCategory.name, ProteinCategory.id),
+                    ProteinCategory.name,
+                    missing,
+                )
+            )
+
+        # Pairs that are already linked are skipped by the unique pair index
+        # that create_tables maintains, so no lookup of existing links is
+        # needed
+        pairs = dict.fromkeys(
+            (protein_id, category_ids[name]) for protein_id, name in links
+        )
+        session.execute(
+            sqlite_insert(protein_category_association).on_conflict_do_nothing(
+                index_elements=[
+                    protein_category_association.c.protein_id,
+                    protein_category_association.c.category_id,
+                ]
+            ),
+            [
+                {"protein_id": protein_id, "category_id": category_id}
+                for protein_id, category_id in pairs
+            ],
+        )
+
+    @staticmethod
+    def _build_protein_row(pdb_id: str, row: Dict) -> Dict:
+        """
+        Build the column values for a new protein from an enhanced CSV row.
+
+        Args:
+            pdb_id: PDB ID of the protein
+            row: CSV row as a dictionary
+
+        Returns:
+            Dictionary of Protein column values
+        """
+        # Parse chains data safely
+        try:
+            chains_data = row["chains"]
+            if isinstance(chains_data, str):
+                chains_data = _quoted_json(row, "chains")
+        except (orjson.JSONDecodeError, TypeError, KeyError) as e:
+            chains_data = {}
+            logger.warning(f"Could not parse chains data for {pdb_id}: {e}")
+
+        # Parse experimental quality data safely
+        exp_quality = {}
+        if "experimental_quality" in row and pd.notna(row["experimental_quality"]):
+            exp_quality = {"quality_level": row["experimental_quality"]}
+            logger.debug(f"Parsed experimental quality for {pdb_id}: {exp_quality}")
+
+        if "experimental_conditions" in row and pd.notna(
+            row["experimental_conditions"]
+        ):
+            method = _quoted_json(row, "experimental_conditions")
+            exp_quality["structure_method"] = method.get("method", "")
+            exp_quality["resolution"] = method.get("resolution", None)
+            exp_quality["temperature"] = method.get("temperature", None)
+            logger.debug(f"Parsed experimental conditions for {pdb_id}: {exp_quality}")
+
+        return {
+            "pdb_id": pdb_id,
+            "title": row.get("title", ""),
+            "description": f"Enhanced structure {pdb_id} from categorization pipeline",
+            "quality": exp_quality.get("quality_level", ""),
+            "temperature": exp_quality.get("temperature"),
+            "resolution": exp_quality.get("resolution"),
+            "experiment_type": exp_quality.get("structure_method", ""),
+            "num_chains": row.get("num_chains", 0),
+            "chain_data": chains_to_dict(chains_data),
+            "status": row.get("status", ""),
+        }
+
+    @staticmethod
+    def _parse_enhanced_row(row: Dict) -> Dict:
+        """
+        Parse the families and ligands of an enhanced CSV row.
+
+        Args:
+            row: CSV row as a dictionary
+
+        Returns:
+            Dictionary with the PDB ID, family names and ligand rows; ligands
+            is None when the row carries no ligand data
+        """
+        pdb_id = row["pdb_id"]
+        parsed = {"pdb_id": pdb_id, "families": [], "ligands": None}
+
+        # Parse protein families/categories
+        if "protein_families" in row and pd.notna(row["protein_families"]):
+            try:
+                # Handle different formats (string, list, etc.)
+                families = row["protein_families"]
+                if isinstance(families, str):
+                    # Try to parse as JSON/list
                     try:
-                        # Handle different formats (string, list, etc.)
-                        families = row["protein_families"]
-                        if isinstance(families, str):
-                            # Try to parse as JSON/list
-                            try:
-                                families = json.loads(families.replace("'", '"'))
-                            except (json.JSONDecodeError, ValueError):
-                                # If can't parse, treat as single string
-                                families = [families]
-
-                        # Convert to list if it's a single item
-                        if not isinstance(families, list):
-                            families = [families]
-
-                        # Update protein categories
-                        for family in families:
-                            # Check if category exists
-                            category = (
-                                session.query(ProteinCategory)
-                                .filter(ProteinCategory.name == family)
-                                .first()
-                            )
-                            if not category:
-                                category = ProteinCategory(
-                                    name=family, description=f"Protein family: {family}"
-                                )
-                                session.add(category)
-                                session.flush()
-
-                            # Add category to protein if not already there
-                            if category not in protein.categories:
-                                protein.categories.append(category)
-                    except Exception as e:
-                        logger.warning(
-                            f"Error processing protein families for {pdb_id}: {e}"
+                        families = _quoted_json(row, "protein_families")
+                    except (orjson.JSONDecodeError, ValueError):
+                        # If can't parse, treat as single string
+                        families = [families]
+
+                # Convert to list if it's a single item
+                if not isinstance(families, list):
+                    families = [families]
+
+                parsed["families"] = families
+            except Exception as e:
+                logger.warning(
+                    f"Error processing protein families for {pdb_id}: {e}"
+                )
+
+        # Process binding sites and metrics if available
+        binding_metrics = {}
+        if "binding_metrics" in row and pd.notna(row["binding_metrics"]):
+            try:
+                if isinstance(row["binding_metrics"], str):
+                    # First try standard JSON parsing
+                    try:
+                        binding_metrics = _quoted_json(row, "binding_metrics")
+                    except orjson.JSONDecodeError:
+                        # If that fails, try with additional replacements for special characters
+                        binding_metrics = orjson.loads(
+                            row["binding_metrics"]
+                            .translate(_QUOTE_FIX)
+                            .replace("&Delta;", "Delta_")
                         )
+                else:
+                    binding_metrics = row["binding_metrics"]
 
-                # Process binding sites and metrics if available
+                logger.debug(
+                    f"Parsed binding metrics for {pdb_id}: {binding_metrics}"
+                )
+            except (orjson.JSONDecodeError, TypeError, ValueError) as e:
+                logger.warning(
+                    f"Could not parse binding metrics for {pdb_id}: {e}"
+                )
                 binding_metrics = {}
-                if "binding_metrics" in row and pd.notna(row["binding_metrics"]):
+
+        # Merge the per-ligand "ligand_binding" entries into one lookup table
+        # so each candidate key below is a single dict lookup. Top-level keys
+        # win, as they were checked first
+        binding_index = {}
+        if isinstance(binding_metrics, dict):
+            ligand_binding = binding_metrics.get("ligand_binding")
+            if isinstance(ligand_binding, dict):
+                binding_index = {**ligand_binding, **binding_metrics}
+            else:
+                binding_index = binding_metrics
+
+        # Process ligands
+        if ("ligands" in row and pd.notna(row["ligands"])) or (
+            "enhanced_ligands" in row and pd.notna(row["enhanced_ligands"])
+        ):
+            # Prefer enhanced ligands if available
+            ligand_data_field = (
+                "enhanced_ligands"
+                if "enhanced_ligands" in row
+                and pd.notna(row["enhanced_ligands"])
+                else "ligands"
+            )
+
+            try:
+                # Parse ligand data
+                ligands_data = row[ligand_data_field]
+                if isinstance(ligands_data, str):
+                    # Try various parsing methods
                     try:
-                        if isinstance(row["binding_metrics"], str):
-                            # First try standard JSON parsing
+                        ligands_data = _quoted_json(row, ligand_data_field)
+                    except (orjson.JSONDecodeError, TypeError):
+                        # Normalizing the Python literals handles most of
+                        # these cells without compiling them with ast
+                        try:
+                            ligands_data = _loads_python_literal(ligands_data)
+                        except orjson.JSONDecodeError:
                             try:
-                                binding_metrics = json.loads(
-                                    row["binding_metrics"].replace("'", '"')
+                                ligands_data = ast.literal_eval(ligands_data)
+                            except (ValueError, SyntaxError) as e:
+                                logger.warning(
+                                    f"Could not parse ligands for {pdb_id}: {e}"
                                 )
-                            except json.JSONDecodeError:
-                                # If that fails, try with additional replacements for special characters
-                                binding_metrics = json.loads(
-                                    row["binding_metrics"]
-                                    .replace("'", '"')
-                                    .replace("&Delta;", "Delta_")
-                                    .replace("-T&Delta;S", "neg_TDelta_S")
+                                ligands_data = []
+
+                ligand_rows = []
+                for ligand in ligands_data:
+                    # Get center coordinates safely; list cells from the
+                    # pre-parsed column need no parsing, and missing
+                    # coordinates default to 0
+                    center = ligand.get("center")
+                    if isinstance(center, str):
+                        try:
+                            center = orjson.loads(center.translate(_QUOTE_FIX))
+                        except orjson.JSONDecodeError as e:
+                            logger.warning(
+                                f"Could not parse ligand center for {pdb_id}: {e}"
+                            )
+                            center = None
+                    if not isinstance(center, (list, tuple)):
+                        center = ()
+                    center_x, center_y, center_z = (*center[:3], 0, 0, 0)[:3]
+
+                    # Get binding site data if available
+                    binding_site_data = {}
+                    if "binding_site" in ligand and ligand["binding_site"]:
+                        try:
+                            binding_site_data = ligand["binding_site"]
+                            if isinstance(binding_site_data, str):
+                                binding_site_data = orjson.loads(
+                                    binding_site_data.translate(_QUOTE_FIX)
                                 )
-                        else:
-                            binding_metrics = row["binding_metrics"]
+                        except (
+                            KeyError,
+                            orjson.JSONDecodeError,
+                            TypeError,
+                            ValueError,
+                        ) as e:
+                            logger.warning(
+                                f"Could not parse binding site data for {pdb_id}: {e}"
+                            )
 
-                        logger.debug(
-                            f"Parsed binding metrics for {pdb_id}: {binding_metrics}"
+                    # Create ligand row with all enhanced properties
+                    new_ligand = {
+                        "residue_name": ligand.get("residue_name", ""),
+                        "chain_id": ligand.get("chain_id", ""),
+                        "residue_id": str(ligand.get("ligand_id", "")),
+                        "num_atoms": ligand.get("num_atoms", 0),
+                        "center_x": center_x,
+                        "center_y": center_y,
+                        "center_z": center_z,
+                        # Add binding site information
+                        "binding_site_data": binding_site_data,
+                        "binding_metrics": None,
+                    }
+
+                    # Add binding metrics if available for this ligand
+                    if binding_index:
+                        ligand_id = ligand.get("ligand_id", "")
+                        chain_id = ligand.get("chain_id", "")
+                        residue_name = ligand.get("residue_name", "")
+
+                        # Try different keys that might identify the ligand in binding metrics
+                        binding_keys = (
+                            f"{chain_id}_{ligand_id}",  # Original format
+                            residue_name,  # Just the residue name
+                            f"{chain_id}:{residue_name}",  # Chain:residue format
                         )
-                    except (json.JSONDecodeError, TypeError, ValueError) as e:
-                        logger.warning(
-                            f"Could not parse binding metrics for {pdb_id}: {e}"
-                        )
-                        binding_metrics = {}
 
-                # Process experimental conditions
-                if "experimental_conditions" in row and pd.notna(
-                    row["experimental_conditions"]
-                ):
-                    try:
-                        if isinstance(row["experimental_conditions"], str):
-                            exp_conditions = json.loads(
-                                row["experimental_conditions"].replace("'", '"')
-                            )
-                        else:
-                            exp_conditions = row["experimental_conditions"]
-
-                        # Store experimental conditions as metadata on the protein
-                        protein.exp_conditions = exp_conditions
-                    except (json.JSONDecodeError, TypeError, ValueError) as e:
-                        logger.warning(
-                            f"Could not parse experimental conditions for {pdb_id}: {e}"
-                        )
+                        binding_data = None
+                        for key in binding_keys:
+                            if key in binding_index:
+                                binding_data = binding_index[key]
+                                break
 
-                # Process ligands
-                if ("ligands" in row and pd.notna(row["ligands"])) or (
-                    "enhanced_ligands" in row and pd.notna(row["enhanced_ligands"])
-                ):
-                    # Prefer enhanced ligands if available
-                    ligand_data_field = (
-                        "enhanced_ligands"
-                        if "enhanced_ligands" in row
-                        and pd.notna(row["enhanced_ligands"])
-                        else "ligands"
-                    )
+                        if binding_data:
+                            # Store binding data as JSON in the database
+                            new_ligand["binding_metrics"] = binding_data
 
-                    try:
-                        # Parse ligand data
-                        ligands_data = row[ligand_data_field]
-                        if isinstance(ligands_data, str):
-                            # Try various parsing methods
-                            try:
-                                ligands_data = json.loads(
-                                    ligands_data.replace("'", '"')
-                                )
-                            except (json.JSONDecodeError, TypeError):
-                                try:
-                                    ligands_data = ast.literal_eval(ligands_data)
-                                except (ValueError, SyntaxError) as e:
-                                    logger.warning(
-                                        f"Could not parse ligands for {pdb_id}: {e}"
-                                    )
-                                    ligands_data = []
-
-                        # Clear existing ligands if updating
-                        if existing:
-                            session.query(Ligand).filter(
-                                Ligand.protein_id == protein.id
-                            ).delete()
-
-                        # Add new ligands
-                        for ligand in ligands_data:
-                            # Get center coordinates safely
-                            center = [0, 0, 0]
-                            if "center" in ligand:
-                                try:
-                                    center = ligand["center"]
-                                    if isinstance(center, str):
-                                        center = json.loads(center.replace("'", '"'))
-                                except (
-                                    KeyError,
-                                    json.JSONDecodeError,
-                                    TypeError,
-                                    ValueError,
-                                ) as e:
-                                    logger.warning(
-                                        f"Could not parse ligand center for {pdb_id}: {e}"
-                                    )
-
-                            # Get binding site data if available
-                            binding_site_data = {}
-                            if "binding_site" in ligand and ligand["binding_site"]:
-                                try:
-                                    binding_site_data = ligand["binding_site"]
-                                    if isinstance(binding_site_data, str):
-                                        binding_site_data = json.loads(
-                                            binding_site_data.replace("'", '"')
-                                        )
-                                except (
-                                    KeyError,
-                                    json.JSONDecodeError,
-                                    TypeError,
-                                    ValueError,
-                                ) as e:
-                                    logger.warning(
-                                        f"Could not parse binding site data for {pdb_id}: {e}"
-                                    )
-
-                            # Create ligand with all enhanced properties
-                            new_ligand = Ligand(
-                                protein_id=protein.id,
-                                residue_name=ligand.get("residue_name", ""),
-                                chain_id=ligand.get("chain_id", ""),
-                                residue_id=str(ligand.get("ligand_id", "")),
-                                num_atoms=ligand.get("num_atoms", 0),
-                                center_x=center[0] if len(center) > 0 else 0,
-                                center_y=center[1] if len(center) > 1 else 0,
-                                center_z=center[2] if len(center) > 2 else 0,
-                                # Add binding site information
-                                binding_site_data=binding_site_data,
-                            )
+                    ligand_rows.append(new_ligand)
 
-                            # Add binding metrics if available for this ligand
-                            if binding_metrics:
-                                ligand_id = ligand.get("ligand_id", "")
-                                chain_id = ligand.get("chain_id", "")
-                                residue_name = ligand.get("residue_name", "")
-
-                                # Try different keys that might identify the ligand in binding metrics
-                                binding_keys = [
-                                    f"{chain_id}_{ligand_id}",  # Original format
-                                    residue_name,  # Just the residue name
-                                    f"{chain_id}:{residue_name}",  # Chain:residue format
-                                ]
-
-                                binding_data = None
-                                # Try to find the ligand in binding metrics using different possible keys
-                                for key in binding_keys:
-                                    if key in binding_metrics:
-                                        binding_data = binding_metrics[key]
-                                        break
-                                    elif (
-                                        "ligand_binding" in binding_metrics
-                                        and key in binding_metrics["ligand_binding"]
-                                    ):
-                                        binding_data = binding_metrics[
-                                            "ligand_binding"
-                                        ][key]
-                                        break
-
-                                if binding_data:
-                                    # Store binding data as JSON in the database
-                                    new_ligand.binding_metrics = binding_data
-
-                            session.add(new_ligand)
-                    except Exception as e:
-                        logger.warning(f"Error processing ligands for {pdb_id}: {e}")
-
-                # Commit every 10 proteins for performance
-                if (imported_count + updated_count) % 10 == 0:
-                    session.commit()
-                    logger.debug("Committed batch of 10 proteins")
-
-            # Final commit
-            session.commit()
-            logger.info(
-                f"Database import complete: {imported_count} new proteins, {updated_count} updated"
-            )
-            return True
+                parsed["ligands"] = ligand_rows
+            except Exception as e:
+                logger.warning(f"Error processing ligands for {pdb_id}: {e}")
+
+        return parsed
 
+    def normalize_chain_data(self):
+        """
+        Rewrite chain_data stored as a list of chain records into the
+        dictionary layout keyed by chain ID. Safe to run repeatedly.
+
+        Returns:
+            int: Number of proteins rewritten
+        """
+        session = self.get_session()
+        try:
+            rows = [
+                {
+                    "id": protein_id,
+                    "chain_data": chains_to_dict(chain_data),
+                    # Keep updated_at: the content is unchanged, only its layout
+                    "updated_at": updated_at,
+                }
+                for protein_id, chain_data, updated_at in session.query(
+                    Protein.id, Protein.chain_data, Protein.updated_at
+                ).filter(func.json_type(Protein.chain_data) == "array")
+            ]
+            if rows:
+                session.execute(update(Protein), rows)
+                session.commit()
+                logger.info(f"Normalized chain data for {len(rows)} proteins")
+            return len(rows)
         except Exception as e:
             session.rollback()
-            logger.error(f"Error during database import: {e}")
-            return False
+            logger.error(f"Error normalizing chain data: {e}")
+            return 0
         finally:
             session.close()
 
-    def get_all_proteins(self, limit=None, offset=0):
-        """Get all proteins from the database without pagination."""
-        session = self.get_session()
-        try:
-            query = session.query(Protein).order_by(Protein.pdb_id)
+    def get_all_proteins(
+        self, limit=None, offset=0, columns=None, after_id=None, session=None
+    ):
+        """
+        Get proteins from the database ordered by ID.
+
+        Args:
+            limit: Maximum number of proteins to return
+            offset: Number of proteins to skip
+            columns: Optional names of Protein columns to select; matching rows
+                     are returned instead of Protein objects
+            after_id: Optional keyset cursor; only proteins with a larger ID are returned
+            session: Optional caller-owned session to run the query on
+        """
+        with self.session_scope(session) as session:
+            query = session.query(Protein).order_by(Protein.id)
+            if after_id is not None:
+                query = query.filter(Protein.id > after_id)
+            if columns:
+                # Plain rows skip ORM object construction and the identity map
+                query = query.with_entities(*(getattr(Protein, c) for c in columns))
+            else:
+                query = query.options(*PROTEIN_LOAD_OPTIONS)
             # Apply limit only if specified
             if limit:
                 query = query.limit(limit).offset(offset)
             proteins = query.all()
             return proteins
-        finally:
-            session.close()
 
     def get_protein_by_pdb_id(self, pdb_id):
         """Get a protein by PDB ID."""
-        session = self.get_session()
-        try:
-            protein = session.query(Protein).filter(Protein.pdb_id == pdb_id).first()
+        with self.session_scope() as session:
+            protein = (
+                session.query(Protein)
+                .options(*PROTEIN_LOAD_OPTIONS)
+                .filter(Protein.pdb_id == pdb_id)
+                .first()
+            )
             return protein
-        finally:
-            session.close()
 
     def get_ligands_by_protein_id(self, protein_id):
         """Get all ligands for a protein."""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             ligands = (
                 session.query(Ligand).filter(Ligand.protein_id == protein_id).all()
             )
             return ligands
-        finally:
-            session.close()
 
-    def get_proteins_by_category(self, category_name, limit=None, offset=0):
-        """Get all proteins by category name without pagination."""
-        session = self.get_session()
-        try:
+    def get_proteins_by_category(
+        self,
+        category_name,
+        limit=None,
+        offset=0,
+        columns=None,
+        after_id=None,
+        session=None,
+    ):
+        """
+        Get proteins by category name ordered by ID.
+
+        Args:
+            category_name: Name of the protein category
+            limit: Maximum number of proteins to return
+            offset: Number of proteins to skip
+            columns: Optional names of Protein columns to select; matching rows
+                     are returned instead of Protein objects
+            after_id: Optional keyset cursor; only proteins with a larger ID are returned
+            session: Optional caller-owned session to run the query on
+        """
+        with self.session_scope(session) as session:
             query = (
                 session.query(Protein)
-                .join(
-                    protein_category_association,
-                    Protein.id == protein_category_association.c.protein_id,
-                )
-                .join(
-                    ProteinCategory,
-                    ProteinCategory.id == protein_category_association.c.category_id,
-                )
+                .join(Protein.categories)
                 .filter(ProteinCategory.name == category_name)
-                .order_by(Protein.pdb_id)
+                .order_by(Protein.id)
             )
+            if after_id is not None:
+                query = query.filter(Protein.id > after_id)
+            if columns:
+                # Plain rows skip ORM object construction and the identity map
+                query = query.with_entities(*(getattr(Protein, c) for c in columns))
+            else:
+                query = query.options(*PROTEIN_LOAD_OPTIONS)
 
             # Apply limit only if specified
             if limit:
@@ -437,26 +909,31 @@ class DatabaseService:
 
             proteins = query.all()
             return proteins
-        finally:
-            session.close()
 
-    def get_database_stats(self):
-        """Get basic database statistics."""
+    def get_database_stats(self, session=None):
+        """
+        Get basic database statistics.
+
+        Args:
+            session: Optional caller-owned session to run the queries on
+        """
         from datetime import datetime
 
-        session = self.get_session()
-        try:
+        with self.session_scope(session) as session:
+            # One statement with a scalar subquery per table instead of three
+            # separate COUNT queries
+            protein_count, ligand_count, category_count = session.query(
+                select(func.count(Protein.id)).scalar_subquery(),
+                select(func.count(Ligand.id)).scalar_subquery(),
+                select(func.count(ProteinCategory.id)).scalar_subquery(),
+            ).one()
             stats = {
-                "protein_count": session.query(func.count(Protein.id)).scalar(),
-                "ligand_count": session.query(func.count(Ligand.id)).scalar(),
-                "category_count": session.query(
-                    func.count(ProteinCategory.id)
-                ).scalar(),
+                "protein_count": protein_count,
+                "ligand_count": ligand_count,
+                "category_count": category_count,
                 "last_updated": datetime.now().isoformat()
             }
             return stats
-        finally:
-            session.close()
 
     def update_ligand_properties(self, ligand_id: int, properties: Dict):
         """
@@ -468,16 +945,24 @@ class DatabaseService:
         """
         session = self.get_session()
         try:
-            ligand = session.query(Ligand).filter(Ligand.id == ligand_id).first()
-            if not ligand:
+            values = {
+                key: value
+                for key, value in properties.items()
+                if key in LIGAND_PROPERTY_COLUMNS
+            }
+
+            # Update properties with a single UPDATE; its row count tells
+            # whether the ligand exists
+            if values:
+                found = session.execute(
+                    update(Ligand).where(Ligand.id == ligand_id).values(**values)
+                ).rowcount
+            else:
+                found = session.query(Ligand.id).filter(Ligand.id == ligand_id).first()
+            if not found:
                 logger.error(f"Ligand with ID {ligand_id} not found")
                 return
 
-            # Update properties
-            for key, value in properties.items():
-                if hasattr(ligand, key):
-                    setattr(ligand, key, value)
-
             session.commit()
             logger.debug(f"Updated properties for ligand {ligand_id}")
 
@@ -487,6 +972,45 @@ class DatabaseService:
         finally:
             session.close()
 
+    def update_ligand_properties_bulk(self, updates: List[Dict]) -> bool:
+        """
+        Update the properties of many ligands in one transaction.
+
+        Args:
+            updates: List of dictionaries, each with the ligand "id" and the
+                     properties to set on it
+
+        Returns:
+            bool: True if the updates were committed, False otherwise
+        """
+        rows = []
+        for properties in updates:
+            values = {
+                key: value
+                for key, value in properties.items()
+                if key in LIGAND_PROPERTY_COLUMNS
+            }
+            if values:
+                rows.append({"id": properties["id"], **values})
+        if not rows:
+            return True
+
+        session = self.get_session()
+        try:
+            # ORM bulk UPDATE by primary key: one executemany per set of
+            # updated columns instead of a load and flush per ligand
+            session.execute(update(Ligand), rows)
+            session.commit()
+            logger.debug(f"Updated properties for {len(rows)} ligands")
+            return True
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating ligand properties: {e}")
+            return False
+        finally:
+            session.close()
+
     def update_protein_categories(self, protein_id: int, categories: List[str]):
         """
         Update protein categories in the database.
@@ -497,29 +1021,41 @@ class DatabaseService:
         """
         session = self.get_session()
         try:
-            protein = session.query(Protein).filter(Protein.id == protein_id).first()
-            if not protein:
+            if not session.query(Protein.id).filter(Protein.id == protein_id).first():
                 logger.error(f"Protein with ID {protein_id} not found")
                 return
 
             # Clear existing categories
-            protein.categories = []
-
-            # Add new categories
-            for category_name in categories:
-                # Get or create category
-                category = (
-                    session.query(ProteinCategory)
-                    .filter(ProteinCategory.name == category_name)
-                    .first()
+            session.execute(
+                delete(protein_category_association).where(
+                    protein_category_association.c.protein_id == protein_id
                 )
+            )
 
-                if not category:
-                    category = ProteinCategory(name=category_name)
-                    session.add(category)
-                    session.flush()
-
-                protein.categories.append(category)
+            # Add new categories, creating missing ones and linking each once,
+            # with multi-row statements instead of a lookup per category
+            names = list(dict.fromkeys(categories))
+            if names:
+                session.execute(
+                    sqlite_insert(ProteinCategory).on_conflict_do_nothing(
+                        index_elements=[ProteinCategory.name]
+                    ),
+                    [{"name": name} for name in names],
+                )
+                category_ids = dict(
+                    _query_in_chunks(
+                        session.query(ProteinCategory.name, ProteinCategory.id),
+                        ProteinCategory.name,
+                        names,
+                    )
+                )
+                session.execute(
+                    insert(protein_category_association),
+                    [
+                        {"protein_id": protein_id, "category_id": category_ids[name]}
+                        for name in names
+                    ],
+                )
 
             session.commit()
             logger.debug(f"Updated categories for protein {protein_id}: {categories}")
@@ -579,7 +1115,64 @@ class DatabaseService:
             return False
         finally:
             session.close()
-    
+
+    def store_protein_ipfs_hashes_bulk(self, hashes: Dict[str, str]):
+        """
+        Store IPFS hashes for many proteins in a single transaction.
+
+        Existing hashes for the given proteins are replaced using one DELETE
+        and one multi-row INSERT rather than a statement per protein.
+
+        Args:
+            hashes: Mapping of PDB ID to IPFS hash
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not hashes:
+            return True
+
+        session = self.get_session()
+        try:
+            from .models import ProteinIPFS
+
+            known_ids = {
+                pdb_id
+                for (pdb_id,) in _query_in_chunks(
+                    session.query(Protein.pdb_id), Protein.pdb_id, hashes
+                )
+            }
+            for pdb_id in hashes.keys() - known_ids:
+                logger.error(f"Protein with PDB ID {pdb_id} not found")
+
+            rows = [
+                {"protein_pdb_id": pdb_id, "ipfs_hash": ipfs_hash}
+                for pdb_id, ipfs_hash in hashes.items()
+                if pdb_id in known_ids
+            ]
+            if rows:
+                known_list = list(known_ids)
+                for start in range(0, len(known_list), IN_CLAUSE_CHUNK_SIZE):
+                    session.execute(
+                        delete(ProteinIPFS).where(
+                            ProteinIPFS.protein_pdb_id.in_(
+                                known_list[start : start + IN_CLAUSE_CHUNK_SIZE]
+                            )
+                        )
+                    )
+                session.execute(insert(ProteinIPFS), rows)
+
+            session.commit()
+            logger.debug(f"Stored IPFS hashes for {len(rows)} proteins")
+            return True
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error storing IPFS hashes: {e}")
+            return False
+        finally:
+            session.close()
+
     def get_all_protein_ipfs_hashes(self):
         """
         Get all stored IPFS hashes for proteins.
@@ -587,39 +1180,35 @@ class DatabaseService:
         Returns:
             List of dictionaries with protein_pdb_id and ipfs_hash
         """
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             from .models import ProteinIPFS
             
             results = session.query(ProteinIPFS).all()
             return [{"protein_id": item.protein_pdb_id, "hash": item.ipfs_hash} for item in results]
-        finally:
-            session.close()
     
-    def get_ipfs_hash_by_protein_id(self, protein_id: str):
+    def get_ipfs_hash_by_protein_id(self, protein_id: str, session=None):
         """
         Get the IPFS hash for a specific protein by its PDB ID with structured response.
         
         Args:
             protein_id: PDB ID of the protein
+            session: Optional caller-owned session to run the query on
                 
         Returns:
             dict: Dictionary with 'protein_id' and 'hash' if found,
                 or just 'protein_id' with None hash if not found
         """
-        session = self.get_session()
-        try:
-            from .models import ProteinIPFS
-            
-            result = session.query(ProteinIPFS).filter(
-                ProteinIPFS.protein_pdb_id == protein_id
-            ).first()
-            
-            if result:
-                return {"protein_id": protein_id, "hash": result.ipfs_hash}
-            return {"protein_id": protein_id, "hash": None}
-        except Exception as e:
-            logger.error(f"Error retrieving IPFS hash for {protein_id}: {e}")
-            return {"protein_id": protein_id, "hash": None, "error": str(e)}
-        finally:
-            session.close()
\ No newline at end of file
+        with self.session_scope(session) as session:
+            try:
+                from .models import ProteinIPFS
+
+                result = session.query(ProteinIPFS).filter(
+                    ProteinIPFS.protein_pdb_id == protein_id
+                ).first()
+
+                if result:
+                    return {"protein_id": protein_id, "hash": result.ipfs_hash}
+                return {"protein_id": protein_id, "hash": None}
+            except Exception as e:
+                logger.error(f"Error retrieving IPFS hash for {protein_id}: {e}")
+                return {"protein_id": protein_id, "hash": None, "error": str(e)}
\ No newline at end of file
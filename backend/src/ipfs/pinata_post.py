@@ -1,12 +1,55 @@
+import asyncio
 import requests
 import json
 import os
+import aiohttp
+import orjson
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, AsyncIterator, Iterable, Optional, Tuple, Union
 
 # load env variable from .env
 load_dotenv()
 
+PINATA_JSON_URL = "https://api.pinata.cloud/pinning/pinJSONToIPFS"
+
+# Upper bound on in-flight Pinata requests for the async uploader
+MAX_CONCURRENT_UPLOADS = 16
+MAX_POOLED_CONNECTIONS = 32
+MAX_UPLOAD_ATTEMPTS = 3
+UPLOAD_QUEUE_SIZE = 8
+
+# Keep-alive session for synchronous uploads, created on first use
+_requests_session: Optional[requests.Session] = None
+
+
+def _get_requests_session() -> requests.Session:
+    """
+    Return the shared requests session for synchronous Pinata uploads.
+
+    Connections are kept alive between calls, so only the first upload pays
+    the TLS handshake, and transient errors are retried with backoff.
+
+    Returns:
+        Shared requests.Session
+    """
+    global _requests_session
+    if _requests_session is None:
+        retry = Retry(
+            total=MAX_UPLOAD_ATTEMPTS - 1,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"],
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=MAX_POOLED_CONNECTIONS, max_retries=retry
+        )
+        _requests_session = requests.Session()
+        _requests_session.mount("https://", adapter)
+        _requests_session.mount("http://", adapter)
+    return _requests_session
+
 
 def upload_json_to_ipfs(
     json_data: Union[Dict[str, Any], List[Dict[str, Any]]],
@@ -21,7 +64,7 @@ def upload_json_to_ipfs(
         For a single JSON object: Dictionary with 'hash' and 'protein_id'
         For multiple JSON objects: List of dictionaries with 'hash' and 'protein_id'
     """
-    url = "https://api.pinata.cloud/pinning/pinJSONToIPFS"
+    url = PINATA_JSON_URL
     jwt_token = os.getenv("PINATA_JWT_TOKEN")
 
     if not jwt_token:
@@ -38,7 +81,9 @@ def upload_json_to_ipfs(
     # Handle single JSON object case
     if isinstance(json_data, dict):
         try:
-            response = requests.post(url, headers=headers, json=json_data)
+            response = _get_requests_session().post(
+                url, headers=headers, json=json_data
+            )
             response.raise_for_status()
             ipfs_hash = response.json().get("IpfsHash")
 
@@ -52,23 +97,184 @@ def upload_json_to_ipfs(
             print(f"Request failed: {e}")
             return {"hash": None, "protein_id": None}
 
-    # Handle list of JSON objects case
-    ipfs_results = []
-    for json_file in json_data:
+    # Upload lists concurrently over one pooled connection set; blocking on
+    # each request in turn would pay a full round-trip per document
+    return asyncio.run(upload_json_to_ipfs_async(json_data))
+
+
+def create_ipfs_session(
+    max_connections: int = MAX_POOLED_CONNECTIONS,
+) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with a keep-alive connection pool for Pinata.
+
+    Share one session across uploads so TCP/TLS handshakes are amortized.
+    Must be created inside a running event loop and closed when done.
+
+    Args:
+        max_connections: Maximum number of pooled connections
+
+    Returns:
+        Client session to pass to the async upload functions
+    """
+    connector = aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def _pin_json_async(
+    session: aiohttp.ClientSession,
+    headers: Dict[str, str],
+    body: bytes,
+    protein_id: Optional[str],
+) -> Dict[str, Optional[str]]:
+    """
+    Pin a single serialized JSON object, retrying with exponential backoff.
+
+    Args:
+        session: Shared aiohttp session used for connection pooling
+        headers: Request headers including the Pinata JWT
+        body: JSON document already encoded to bytes
+        protein_id: PDB ID the document belongs to
+
+    Returns:
+        Dictionary with 'hash' and 'protein_id' (both None on failure)
+    """
+    for attempt in range(MAX_UPLOAD_ATTEMPTS):
         try:
-            response = requests.post(url, headers=headers, json=json_file)
-            response.raise_for_status()
-            ipfs_hash = response.json().get("IpfsHash")
+            async with session.post(
+                PINATA_JSON_URL, headers=headers, data=body
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
 
+            ipfs_hash = result.get("IpfsHash")
             if ipfs_hash:
-                protein_id = json_file.get("protein", {}).get("pdb_id")
-                result = {"hash": ipfs_hash, "protein_id": protein_id}
-                ipfs_results.append(result)
+                return {"hash": ipfs_hash, "protein_id": protein_id}
+
+            print(f"Error: No IPFS hash in response - {result}")
+            return {"hash": None, "protein_id": None}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Other client errors (bad or expired JWT, rejected payload) fail
+            # the same way on every attempt, so only connection errors,
+            # timeouts, rate limiting and server errors are retried
+            if (
+                isinstance(e, aiohttp.ClientResponseError)
+                and e.status != 429
+                and e.status < 500
+            ):
+                print(f"Request failed: {e}")
+                return {"hash": None, "protein_id": None}
+            print(f"Request failed (attempt {attempt + 1}/{MAX_UPLOAD_ATTEMPTS}): {e}")
+            if attempt + 1 < MAX_UPLOAD_ATTEMPTS:
+                await asyncio.sleep(2**attempt)
+
+    return {"hash": None, "protein_id": None}
+
+
+async def iter_upload_json_to_ipfs(
+    json_data: Iterable[Dict[str, Any]],
+    max_concurrency: int = MAX_CONCURRENT_UPLOADS,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> AsyncIterator[Tuple[int, Dict[str, Optional[str]]]]:
+    """
+    Upload multiple JSON objects to IPFS via Pinata concurrently, yielding
+    each result as soon as its upload completes.
+
+    A producer serializes documents onto a bounded queue while a pool of
+    consumers uploads them, so encoding of the next document overlaps the
+    network round-trip of the previous ones.
+
+    Args:
+        json_data: JSON objects to upload (may be a lazy generator)
+        max_concurrency: Maximum number of uploads in flight at once
+        session: Shared session from create_ipfs_session; a temporary one
+                 is created (and closed) when omitted
+
+    Yields:
+        Tuples of (input index, dictionary with 'hash' and 'protein_id'),
+        in completion order
+    """
+    jwt_token = os.getenv("PINATA_JWT_TOKEN")
+
+    if not jwt_token:
+        print(
+            "JWT token not found. Please set the PINATA_JWT_TOKEN environment variable."
+        )
+        return
+
+    headers = {
+        "Authorization": f"Bearer {jwt_token}",
+        "Content-Type": "application/json",
+    }
+    jobs: asyncio.Queue = asyncio.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            for index, item in enumerate(json_data):
+                protein_id = item.get("protein", {}).get("pdb_id")
+                await jobs.put((index, orjson.dumps(item), protein_id))
+        finally:
+            for _ in range(max_concurrency):
+                await jobs.put(None)
+
+    async def consume(session: aiohttp.ClientSession):
+        try:
+            while True:
+                job = await jobs.get()
+                if job is None:
+                    return
+                index, body, protein_id = job
+                result = await _pin_json_async(session, headers, body, protein_id)
+                await results.put((index, result))
+        finally:
+            await results.put(None)
+
+    owns_session = session is None
+    if owns_session:
+        session = create_ipfs_session(max_concurrency)
+
+    tasks = [asyncio.create_task(produce())] + [
+        asyncio.create_task(consume(session)) for _ in range(max_concurrency)
+    ]
+    try:
+        finished = 0
+        while finished < max_concurrency:
+            item = await results.get()
+            if item is None:
+                finished += 1
             else:
-                print(f"Error: No IPFS hash in response - {response.json()}")
-                ipfs_results.append({"hash": None, "protein_id": None})
-        except requests.exceptions.RequestException as e:
-            print(f"Request failed: {e}")
-            ipfs_results.append({"hash": None, "protein_id": None})
+                yield item
+
+        # Surface any error raised by the producer or a consumer
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if owns_session:
+            await session.close()
 
-    return ipfs_results
+
+async def upload_json_to_ipfs_async(
+    json_data: Iterable[Dict[str, Any]],
+    max_concurrency: int = MAX_CONCURRENT_UPLOADS,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> List[Dict[str, Optional[str]]]:
+    """
+    Upload multiple JSON objects to IPFS via Pinata concurrently.
+
+    Args:
+        json_data: JSON objects to upload (may be a lazy generator)
+        max_concurrency: Maximum number of uploads in flight at once
+        session: Optional shared session from create_ipfs_session
+
+    Returns:
+        List of dictionaries with 'hash' and 'protein_id', in input order
+    """
+    results = {
+        index: result
+        async for index, result in iter_upload_json_to_ipfs(
+            json_data, max_concurrency, session
+        )
+    }
+    return [results[index] for index in sorted(results)]
@@ -1,4 +1,5 @@
 import argparse
+import ast
 import json
 import time
 from pathlib import Path
@@ -92,32 +93,33 @@ def main():
 
     if args.download:
         logger.info("Starting PDB download process")
-        collector = PDBCollector(output_dir="data/raw")
-
-        # Create search query
-        query = collector.create_query_for_protein_ligand_complexes(
-            resolution_cutoff=args.resolution, has_ligands=True
-        )
-
-        # Search for PDB IDs
-        pdb_ids = collector.search_by_query(query)
-        logger.info(f"Found {len(pdb_ids)} PDB entries matching criteria")
-
-        # Limit number of downloads if specified
-        if args.limit and args.limit < len(pdb_ids):
-            pdb_ids = pdb_ids[: args.limit]
-            logger.info(f"Limited to {args.limit} structures")
+        with PDBCollector(output_dir="data/raw") as collector:
+            # Create search query
+            query = collector.create_query_for_protein_ligand_complexes(
+                resolution_cutoff=args.resolution, has_ligands=True
+            )
 
-        # Download PDB files
-        start_time = time.time()
-        downloaded_files = collector.batch_download(
-            pdb_ids, file_format=args.format, collect_metadata=args.collect_metadata
-        )
-        elapsed_time = time.time() - start_time
+            # Search for PDB IDs
+            pdb_ids = collector.search_by_query(query)
+            logger.info(f"Found {len(pdb_ids)} PDB entries matching criteria")
+
+            # Limit number of downloads if specified
+            if args.limit and args.limit < len(pdb_ids):
+                pdb_ids = pdb_ids[: args.limit]
+                logger.info(f"Limited to {args.limit} structures")
+
+            # Download PDB files
+            start_time = time.time()
+            downloaded_files = collector.batch_download(
+                pdb_ids,
+                file_format=args.format,
+                collect_metadata=args.collect_metadata,
+            )
+            elapsed_time = time.time() - start_time
 
-        logger.info(
-            f"Downloaded {len(downloaded_files)} files in {elapsed_time:.2f} seconds"
-        )
+            logger.info(
+                f"Downloaded {len(downloaded_files)} files in {elapsed_time:.2f} seconds"
+            )
 
         # Save downloaded PDB IDs for later processing
         with open("data/downloaded_pdbs.json", "w") as f:
@@ -197,13 +199,16 @@ def main():
 
         # Print summary of categorization
         if not enhanced_df.empty and "protein_families" in enhanced_df.columns:
-            family_counts = {}
-            for _, row in enhanced_df.iterrows():
-                families = row["protein_families"]
-                if isinstance(families, str):
-                    families = eval(families)
-                for family in families:
-                    family_counts[family] = family_counts.get(family, 0) + 1
+            family_counts = (
+                enhanced_df["protein_families"]
+                .map(
+                    lambda families: ast.literal_eval(families)
+                    if isinstance(families, str)
+                    else families
+                )
+                .explode()
+                .value_counts()
+            )
 
             logger.info("Protein family distribution:")
             for family, count in family_counts.items():
@@ -214,6 +219,7 @@ def main():
         logger.info("Initializing database schema")
         db_service = DatabaseService()
         db_service.create_tables()
+        db_service.normalize_chain_data()
         logger.info("Database schema initialized")
 
     if args.import_db:
@@ -19,11 +19,19 @@ def main():
     port = int(os.environ.get("API_PORT", 8000))
     
     logger.info(f"Starting API server on port {port}")
+    # Auto-reload watches the source tree and is only wanted in development
+    reload = os.environ.get("API_RELOAD") == "1"
+
+    # uvloop and httptools are used when installed (uvicorn[standard]).
+    # Stay on one worker: IPFS upload jobs and the response caches live in
+    # process memory, so a second worker would not see them
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=port,
-        reload=True,  # Set to False in production
+        reload=reload,
+        loop="auto",
+        http="auto",
         log_level="info"
     )
 
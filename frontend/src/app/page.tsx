@@ -13,6 +13,8 @@ import {
 
 export default function Home() {
   const [proteins, setProteins] = useState<Protein[]>([]);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [categories, setCategories] = useState<Category[]>([]);
   const [stats, setStats] = useState<DatabaseStats | null>(null);
   const [selectedCategory, setSelectedCategory] = useState<string | null>(null);
@@ -24,9 +26,10 @@ export default function Home() {
       try {
         setLoading(true);
 
-        // Fetch proteins (with optional category filter)
+        // Fetch the first page of proteins (with optional category filter)
         const proteinsData = await getProteins(selectedCategory || undefined);
         setProteins(proteinsData.proteins);
+        setNextCursor(proteinsData.next_cursor);
 
         // Fetch categories
         const categoriesData = await getCategories();
@@ -48,6 +51,25 @@ export default function Home() {
     fetchData();
   }, [selectedCategory]);
 
+  // Append the next page of proteins using the cursor from the last page
+  async function loadMoreProteins() {
+    if (nextCursor === null) return;
+    try {
+      setLoadingMore(true);
+      const proteinsData = await getProteins(
+        selectedCategory || undefined,
+        nextCursor
+      );
+      setProteins((current) => [...current, ...proteinsData.proteins]);
+      setNextCursor(proteinsData.next_cursor);
+    } catch (err) {
+      console.error("Error fetching more proteins:", err);
+      setError("Failed to load more proteins. Please try again later.");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   return (
     <div className="min-h-screen w-full bg-gradient-to-b from-slate-900 to-slate-800 text-gray-100">
       <div className="max-w-7xl mx-auto p-4 sm:p-8 pb-20">
@@ -272,6 +294,18 @@ export default function Home() {
                     ))}
                   </div>
                 )}
+
+                {!loading && nextCursor !== null && (
+                  <div className="flex justify-center mt-8">
+                    <button
+                      onClick={loadMoreProteins}
+                      disabled={loadingMore}
+                      className="px-4 py-2 rounded-full text-sm bg-slate-700 hover:bg-slate-600 text-gray-200 disabled:opacity-50 transition-colors duration-200"
+                    >
+                      {loadingMore ? "Loading..." : "Load more proteins"}
+                    </button>
+                  </div>
+                )}
               </div>
             </div>
           </section>
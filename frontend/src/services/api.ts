@@ -81,9 +81,8 @@ export interface Ligand {
 }
 
 export interface ProteinListResponse {
-  total: number;
-  offset: number;
   limit: number;
+  next_cursor: number | null;
   proteins: Protein[];
 }
 
@@ -103,13 +102,22 @@ export interface DatabaseStats {
   last_updated: string;
 }
 
-// Fetch all proteins (with optional category filter)
-export async function getProteins(category?: string): Promise<ProteinListResponse> {
-  const url = category 
-    ? `${API_BASE_URL}/proteins/?category=${encodeURIComponent(category)}` 
-    : `${API_BASE_URL}/proteins/`;
-  
-  const response = await fetch(url);
+// Number of proteins requested per page of the protein list
+export const PROTEIN_PAGE_SIZE = 50;
+
+// Fetch one page of proteins (with optional category filter); pass the
+// previous page's next_cursor to fetch the page after it
+export async function getProteins(
+  category?: string,
+  cursor?: number | null,
+  limit: number = PROTEIN_PAGE_SIZE
+): Promise<ProteinListResponse> {
+  const params = new URLSearchParams();
+  if (category) params.set('category', category);
+  if (cursor != null) params.set('cursor', String(cursor));
+  params.set('limit', String(limit));
+
+  const response = await fetch(`${API_BASE_URL}/proteins/?${params.toString()}`);
   if (!response.ok) {
     throw new Error(`Failed to fetch proteins: ${response.statusText}`);
   }